@@ -0,0 +1,138 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from backend.serializer import dumps_json
+
+DEFAULT_CACHE_DIR = os.path.join('output', '.chart_cache')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Bump when chart drawing code changes in a way the spec does not capture
+CHART_CACHE_VERSION = 1
+# Eviction trims the cache to this fraction of max_bytes, so a full cache is not rescanned on every store
+EVICT_TO = 0.9
+
+
+class ChartCache:
+    """Bounded on-disk LRU cache of rendered chart images.
+
+    Keys hash the exact data a chart is drawn from plus its type and spec (every
+    drawing argument, style, DPI, library versions and CHART_CACHE_VERSION), so
+    unchanged charts are reused across reports and even across datasets that share
+    identical columns. Least recently used images are evicted once the cache grows
+    beyond `max_bytes`; a running byte total avoids rescanning the directory on
+    every store.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._total_bytes = None  # Scanned lazily on the first store
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, kind, data, spec):
+        """Content hash of the chart's input data and rendering spec"""
+        digest = hashlib.sha256()
+        digest.update(kind.encode('utf-8'))
+        digest.update(dumps_json({
+            'version': CHART_CACHE_VERSION,
+            'spec': spec,
+            'matplotlib': matplotlib.__version__,
+            'seaborn': sns.__version__
+        }))
+        for item in data:
+            _update_digest(digest, item)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f'{key}.png')
+
+    def fetch(self, key, dest):
+        """Copy a cached image to `dest`; returns False on a miss"""
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, dest)
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    def store(self, key, src):
+        """Add a freshly rendered image to the cache, then enforce the size bound"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        os.close(fd)
+        shutil.copyfile(src, tmp_path)
+        if self._total_bytes is None:
+            self._total_bytes = self._scan_size()
+        try:
+            self._total_bytes -= os.stat(path).st_size  # Replacing an existing entry
+        except FileNotFoundError:
+            pass
+        self._total_bytes += os.stat(tmp_path).st_size
+        os.replace(tmp_path, path)
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self):
+        """(mtime, size, path) of every cached image"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith('.png'):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _evict(self):
+        # Rescan only when the running total says the bound is exceeded; other
+        # processes may share the directory, so the scan also resyncs the total
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes * EVICT_TO:
+                break
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._total_bytes = total
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+def _update_digest(digest, item):
+    """Feed a Series/DataFrame/array/plain value into the hash"""
+    if isinstance(item, (pd.Series, pd.DataFrame)):
+        digest.update(dumps_json([
+            list(item.columns) if isinstance(item, pd.DataFrame) else [item.name],
+            [str(t) for t in (item.dtypes if isinstance(item, pd.DataFrame) else [item.dtype])]
+        ]))
+        digest.update(pd.util.hash_pandas_object(item, index=True).to_numpy().tobytes())
+    elif isinstance(item, np.ndarray):
+        digest.update(str(item.dtype).encode('utf-8'))
+        digest.update(np.ascontiguousarray(item).tobytes())
+    else:
+        digest.update(dumps_json(item))
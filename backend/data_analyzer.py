@@ -7,18 +7,41 @@ from datetime import datetime
 import warnings
 import os
 
+from backend.chart_cache import ChartCache
+from backend.outliers import detect_outliers
+from backend.parallel import analyze_columns_parallel
+from backend.profile_cache import ColumnProfileCache
+from backend.readers import read_table
+from backend.sampling import (PREVIEW_ROW_BUDGET, PREVIEW_TIME_BUDGET, reservoir_sample,
+                              mean_confidence_intervals, share_confidence_intervals)
+from backend.segmentation import SegmentationEngine, default_segment_keys, default_measures
+from backend.serializer import serialize
+
 warnings.filterwarnings('ignore')
 
 class DataAnalyzer:
     """Professional Data Analysis Engine - Dynamic & Robust"""
     
-    def __init__(self, csv_file):
-        self.df = pd.read_csv(csv_file)
+    def __init__(self, data_file, columns=None, preview=False,
+                 row_budget=PREVIEW_ROW_BUDGET, time_budget=PREVIEW_TIME_BUDGET):
+        # CSV (plain or gzip/zstd/bz2/xz-compressed), Parquet or Arrow IPC - detected from magic bytes.
+        # `columns` restricts reading to the columns the analysis needs.
+        self.data_file = data_file
+        self.preview = preview
+        self.sampling_info = None
+        self.profile_cache = None
+        if preview:
+            # Preview mode: analyze a random sample within the row/time budget
+            self.df, self.sampling_info = reservoir_sample(
+                data_file, columns=columns, row_budget=row_budget, time_budget=time_budget)
+        else:
+            self.df = read_table(data_file, columns=columns)
         # Clean column names
         self.df.columns = [str(col).strip() for col in self.df.columns]
         
         self.analysis_results = {}
         self.charts = {}
+        self.chart_cache_stats = None
         self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         # Identify column types
@@ -31,17 +54,45 @@ class DataAnalyzer:
             if 'date' in col.lower() or 'time' in col.lower():
                 try:
                     self.df[col] = pd.to_datetime(self.df[col])
+                    self.profile_cache.invalidate(col)
                     self.date_cols.append(col)
                     self.categorical_cols.remove(col)
                 except:
                     pass
 
-    def perform_analysis(self):
-        """Execute comprehensive data analysis"""
+    @property
+    def df(self):
+        return self._df
+
+    @df.setter
+    def df(self, frame):
+        # Replacing the frame drops every cached column profile
+        self._df = frame
+        if self.profile_cache is None:
+            self.profile_cache = ColumnProfileCache(frame)
+        else:
+            self.profile_cache.reset(frame)
+
+    def perform_analysis(self, segment_by=None, measures=None, top_n=10, workers=1):
+        """Execute comprehensive data analysis
+
+        segment_by: list of segment keys, each a column name or a list of column names
+        (multi-key); defaults to the low-cardinality categorical columns.
+        workers: shard per-column numeric/categorical profiling across this many processes.
+        """
         print("[*] Starting dynamic data analysis...")
         print(f"[*] Dataset size: {len(self.df):,} rows, {len(self.df.columns)} columns")
+        # Drop cached profiles of columns edited in place since the last pass
+        changed = self.profile_cache.refresh()
+        if changed:
+            print(f"[*] Column profiles refreshed for edited columns: {', '.join(map(str, changed))}")
         
         try:
+            # 0. Optional multi-core column profiling (results feed steps 2 and 4)
+            parallel_categorical = None
+            if workers and workers > 1 and len(self.df):
+                parallel_categorical = self._profile_columns_parallel(workers)
+            
             # 1. Basic Overview
             self.analysis_results['basic_stats'] = self._get_basic_stats()
             
@@ -49,18 +100,32 @@ class DataAnalyzer:
             if self.numeric_cols:
                 self.analysis_results['numeric_analysis'] = self._analyze_numeric_columns()
             
-            # 3. Categorical Analysis
+            # 3. Outlier Detection (reuses the numeric profile from step 2)
+            if self.numeric_cols:
+                self.analysis_results['outliers'] = self._detect_outliers()
+            
+            # 4. Categorical Analysis
             if self.categorical_cols:
-                self.analysis_results['categorical_analysis'] = self._analyze_categorical_columns()
+                self.analysis_results['categorical_analysis'] = (
+                    parallel_categorical or self._analyze_categorical_columns())
             
-            # 4. Time Series Analysis (if dates exist)
+            # 5. Time Series Analysis (if dates exist)
             if self.date_cols and self.numeric_cols:
                 self.analysis_results['temporal_analysis'] = self._analyze_temporal_data()
             
-            # 5. Correlation Analysis
+            # 6. Correlation Analysis
             if len(self.numeric_cols) > 1:
                 self.analysis_results['correlations'] = self._analyze_correlations()
             
+            # 7. Segmentation Analysis (categorical keys x numeric measures)
+            segmentation = self._analyze_segments(segment_by, measures, top_n)
+            if segmentation:
+                self.analysis_results['segmentation'] = segmentation
+            
+            # 8. Sampling Confidence Intervals (preview mode only)
+            if self.sampling_info:
+                self.analysis_results['sampling'] = self._analyze_sampling()
+            
             print("[✓] Analysis completed successfully!")
             return self.analysis_results
         except Exception as e:
@@ -72,37 +137,73 @@ class DataAnalyzer:
     def _get_basic_stats(self):
         """Calculate dataset overview statistics"""
         return {
-            'total_records': len(self.df),
+            'total_records': self.sampling_info['population_size'] if self.sampling_info else len(self.df),
             'total_columns': len(self.df.columns),
             'numeric_columns': len(self.numeric_cols),
             'categorical_columns': len(self.categorical_cols),
             'date_columns': len(self.date_cols),
-            'missing_values': self.df.isnull().sum().sum(),
+            'missing_values': sum(self.profile_cache.null_count(col) for col in self.df.columns),
             'duplicate_rows': self.df.duplicated().sum()
         }
     
+    def _profile_columns_parallel(self, workers):
+        """Shard numeric and categorical columns across a process pool via shared memory"""
+        print(f"[*] Profiling {len(self.numeric_cols) + len(self.categorical_cols)} columns on {workers} workers...")
+        numeric_block = self.profile_cache.numeric_block(self.numeric_cols) if self.numeric_cols else None
+        factorized = [self.profile_cache.factorize(col) for col in self.categorical_cols]
+        
+        profile, categorical = analyze_columns_parallel(numeric_block, factorized, workers)
+        
+        if profile is not None:
+            # Outlier detection and later calls reuse the worker-computed profile
+            self.profile_cache.prime('numeric_profile', tuple(self.numeric_cols), profile)
+        
+        stats = {}
+        for col, summary in zip(self.categorical_cols, categorical):
+            top_values = summary['top_values']
+            stats[col] = {
+                'unique_count': summary['unique_count'],
+                'top_values': top_values,
+                'most_frequent': next(iter(top_values)) if top_values else None
+            }
+        return stats
+    
     def _analyze_numeric_columns(self):
         """Detailed analysis of numeric columns"""
+        profile = self.profile_cache.numeric_profile(self.numeric_cols)
         stats = {}
-        for col in self.numeric_cols:
+        for j, col in enumerate(self.numeric_cols):
             stats[col] = {
-                'mean': self.df[col].mean(),
-                'median': self.df[col].median(),
-                'std': self.df[col].std(),
-                'min': self.df[col].min(),
-                'max': self.df[col].max(),
-                'zeros': (self.df[col] == 0).sum()
+                'mean': profile['mean'][j],
+                'median': profile['median'][j],
+                'std': profile['std'][j],
+                'min': profile['min'][j],
+                'max': profile['max'][j],
+                'q1': profile['q1'][j],
+                'q3': profile['q3'][j],
+                'mad': profile['mad'][j],
+                'zeros': profile['zeros'][j]
             }
         return stats
     
+    def _detect_outliers(self):
+        """Flag IQR-fence, robust z-score (MAD) and z-score outliers across all numeric columns"""
+        # Quantiles/MAD are shared with the numeric stats pass through the profile cache
+        block = self.profile_cache.numeric_block(self.numeric_cols)
+        profile = self.profile_cache.numeric_profile(self.numeric_cols)
+        outliers = detect_outliers(block, self.numeric_cols, profile,
+                                   row_labels=self.df.index.to_numpy())
+        print(f"[*] Outlier scan: {outliers['rows_flagged']['any']:,} rows flagged")
+        return outliers
+    
     def _analyze_categorical_columns(self):
         """Detailed analysis of categorical columns"""
         stats = {}
         for col in self.categorical_cols:
             # Limit to top 10 unique values to avoid huge reports
-            value_counts = self.df[col].value_counts()
+            value_counts = self.profile_cache.value_counts(col)
             stats[col] = {
-                'unique_count': self.df[col].nunique(),
+                'unique_count': len(value_counts),
                 'top_values': value_counts.head(10).to_dict(),
                 'most_frequent': value_counts.index[0] if not value_counts.empty else None
             }
@@ -124,7 +225,7 @@ class DataAnalyzer:
 
     def _analyze_correlations(self):
         """Calculate correlation matrix"""
-        corr_matrix = self.df[self.numeric_cols].corr()
+        corr_matrix = self.profile_cache.corr(self.numeric_cols)
         # Find strongest correlations
         correlations = []
         for i in range(len(corr_matrix.columns)):
@@ -139,47 +240,119 @@ class DataAnalyzer:
                     })
         return sorted(correlations, key=lambda x: abs(x['value']), reverse=True)
 
-    def generate_charts(self, output_dir='charts'):
-        """Generate dynamic visualizations based on data types"""
+    def _analyze_segments(self, segment_by=None, measures=None, top_n=10):
+        """Group-by aggregation (sum/mean/count/share, top-N) of measures per segment key"""
+        if segment_by is None:
+            segment_by = default_segment_keys(self.categorical_cols, self.profile_cache.nunique)
+        if measures is None:
+            measures = default_measures(self.numeric_cols)
+        
+        segments = {}
+        for keys in segment_by:
+            keys = [keys] if isinstance(keys, str) else list(keys)
+            missing = [col for col in keys + list(measures) if col not in self.df.columns]
+            if missing:
+                print(f"[!] Skipping segmentation by {', '.join(keys)}: unknown column(s) {', '.join(missing)}")
+                continue
+            engine = SegmentationEngine(keys, measures).update(self.df)
+            segments[' x '.join(keys)] = engine.result(top_n)
+        return segments
+
+    def _analyze_sampling(self):
+        """Describe the preview sample and attach 95% confidence intervals to the sampled estimates"""
+        info = dict(self.sampling_info)
+        info['mean_ci'] = mean_confidence_intervals(self.df, self.numeric_cols, info)
+        info['share_ci'] = share_confidence_intervals(self.df, self.categorical_cols, info)
+        print(f"[*] Preview: sampled {info['sample_size']:,} of {info['population_size']:,} rows "
+              f"({info['method']}, {info['elapsed_seconds']:.1f}s)")
+        return info
+
+    def serialize_results(self, fmt='json'):
+        """Serialize analysis results as compact JSON or MessagePack, returning (payload, content_type)"""
+        if not self.analysis_results:
+            self.perform_analysis()
+
+        return serialize({
+            'generated_at': self.timestamp,
+            'columns': {
+                'numeric': self.numeric_cols,
+                'categorical': self.categorical_cols,
+                'date': self.date_cols
+            },
+            'results': self.analysis_results
+        }, fmt)
+
+    def generate_charts(self, output_dir='charts', dpi=100, chart_cache=None, use_cache=True):
+        """Generate dynamic visualizations based on data types
+
+        Rendered images are reused from `chart_cache` (default: on-disk LRU under
+        output/.chart_cache) when the chart's input data and spec are unchanged.
+        """
         os.makedirs(output_dir, exist_ok=True)
         print("[*] Generating visualizations...")
+        self.profile_cache.refresh()
         
-        sns.set_style("whitegrid")
-        plt.rcParams['figure.facecolor'] = '#f8f9fa'
+        # Every argument that shapes an image lives in its spec, which is part of the cache key
+        base_spec = {'style': 'whitegrid', 'facecolor': '#f8f9fa', 'dpi': dpi, 'tight_layout': True}
+        title_style = {'title_size': 14, 'title_weight': 'bold'}
+        
+        sns.set_style(base_spec['style'])
+        plt.rcParams['figure.facecolor'] = base_spec['facecolor']
+        
+        if use_cache and chart_cache is None:
+            chart_cache = ChartCache()
+        
+        def save_chart(filename, kind, data, spec, draw):
+            """Render via `draw()` unless an identical chart is already cached"""
+            path = os.path.join(output_dir, filename)
+            key = chart_cache.key(kind, data, {**base_spec, **spec}) if chart_cache else None
+            if key and chart_cache.fetch(key, path):
+                return
+            draw()
+            if base_spec['tight_layout']:
+                plt.tight_layout()
+            plt.savefig(path, dpi=base_spec['dpi'])
+            plt.close()
+            if key:
+                chart_cache.store(key, path)
         
         chart_count = 0
         
         # 1. Numeric Distributions (Histograms)
         for i, col in enumerate(self.numeric_cols[:5]): # Limit to first 5 numeric cols
-            plt.figure(figsize=(10, 6))
-            sns.histplot(self.df[col], kde=True, color='#3498db')
-            plt.title(f'Distribution of {col}', fontsize=14, fontweight='bold')
-            plt.tight_layout()
-            plt.savefig(f'{output_dir}/{chart_count:02d}_dist_{col}.png')
-            plt.close()
+            spec = {'figsize': [10, 6], 'kde': True, 'color': '#3498db',
+                    'title': f'Distribution of {col}', **title_style}
+            def draw(col=col, spec=spec):
+                plt.figure(figsize=spec['figsize'])
+                sns.histplot(self.df[col], kde=spec['kde'], color=spec['color'])
+                plt.title(spec['title'], fontsize=spec['title_size'], fontweight=spec['title_weight'])
+            save_chart(f'{chart_count:02d}_dist_{col}.png', 'histogram', [self.df[col]], spec, draw)
             chart_count += 1
             
         # 2. Categorical Counts (Bar Charts)
         for i, col in enumerate(self.categorical_cols[:5]): # Limit to first 5 categorical cols
-            if self.df[col].nunique() < 20: # Only if reasonable number of categories
-                plt.figure(figsize=(12, 6))
-                top_cats = self.df[col].value_counts().head(10)
-                sns.barplot(x=top_cats.index, y=top_cats.values, palette='viridis')
-                plt.title(f'Top 10 {col} Counts', fontsize=14, fontweight='bold')
-                plt.xticks(rotation=45)
-                plt.tight_layout()
-                plt.savefig(f'{output_dir}/{chart_count:02d}_cat_{col}.png')
-                plt.close()
+            if self.profile_cache.nunique(col) < 20: # Only if reasonable number of categories
+                top_cats = self.profile_cache.value_counts(col).head(10)
+                spec = {'figsize': [12, 6], 'palette': 'viridis', 'xtick_rotation': 45,
+                        'title': f'Top 10 {col} Counts', **title_style}
+                def draw(top_cats=top_cats, spec=spec):
+                    plt.figure(figsize=spec['figsize'])
+                    sns.barplot(x=top_cats.index, y=top_cats.values, palette=spec['palette'])
+                    plt.title(spec['title'], fontsize=spec['title_size'], fontweight=spec['title_weight'])
+                    plt.xticks(rotation=spec['xtick_rotation'])
+                save_chart(f'{chart_count:02d}_cat_{col}.png', 'category_bar', [top_cats], spec, draw)
                 chart_count += 1
         
         # 3. Correlation Heatmap
         if len(self.numeric_cols) > 1:
-            plt.figure(figsize=(10, 8))
-            sns.heatmap(self.df[self.numeric_cols].corr(), annot=True, cmap='coolwarm', fmt='.2f')
-            plt.title('Correlation Matrix', fontsize=14, fontweight='bold')
-            plt.tight_layout()
-            plt.savefig(f'{output_dir}/{chart_count:02d}_correlation.png')
-            plt.close()
+            corr_matrix = self.profile_cache.corr(self.numeric_cols)
+            spec = {'figsize': [10, 8], 'annot': True, 'cmap': 'coolwarm', 'fmt': '.2f',
+                    'title': 'Correlation Matrix', **title_style}
+            def draw():
+                plt.figure(figsize=spec['figsize'])
+                sns.heatmap(corr_matrix, annot=spec['annot'], cmap=spec['cmap'], fmt=spec['fmt'])
+                plt.title(spec['title'], fontsize=spec['title_size'], fontweight=spec['title_weight'])
+            save_chart(f'{chart_count:02d}_correlation.png', 'correlation_heatmap', [corr_matrix], spec, draw)
             chart_count += 1
             
         # 4. Time Series (if applicable)
@@ -187,27 +360,70 @@ class DataAnalyzer:
             date_col = self.date_cols[0]
             target_col = self.numeric_cols[0] # Plot first numeric col over time
             
-            plt.figure(figsize=(12, 6))
-            temp_df = self.df.sort_values(date_col)
-            plt.plot(temp_df[date_col], temp_df[target_col], color='#2ecc71')
-            plt.title(f'{target_col} Over Time', fontsize=14, fontweight='bold')
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            plt.savefig(f'{output_dir}/{chart_count:02d}_time_trend.png')
-            plt.close()
+            spec = {'figsize': [12, 6], 'color': '#2ecc71', 'xtick_rotation': 45,
+                    'title': f'{target_col} Over Time', **title_style}
+            def draw():
+                plt.figure(figsize=spec['figsize'])
+                # Cached sort order instead of copying the whole frame with sort_values
+                order = self.profile_cache.sorted_order(date_col)
+                plt.plot(self.df[date_col].to_numpy()[order], self.df[target_col].to_numpy()[order],
+                         color=spec['color'])
+                plt.title(spec['title'], fontsize=spec['title_size'], fontweight=spec['title_weight'])
+                plt.xticks(rotation=spec['xtick_rotation'])
+            save_chart(f'{chart_count:02d}_time_trend.png', 'time_trend',
+                       [self.df[date_col], self.df[target_col]], spec, draw)
             chart_count += 1
             
-        # 5. Scatter Plots for High Correlations
+        # 5. Segment Breakdown (Grouped Bar Charts of shares)
+        for name, segment in list(self.analysis_results.get('segmentation', {}).items())[:3]:
+            top = segment['top_segments']
+            if not top or not segment['measures']:
+                continue
+            
+            spec = {'figsize': [12, 6], 'palette': 'viridis', 'group_width': 0.8, 'xtick_rotation': 45,
+                    'xtick_ha': 'right', 'ylabel': 'Share of Total (%)', 'legend': True,
+                    'title': f'Top {len(top)} Segments by {name}', **title_style}
+            def draw(segment=segment, top=top, spec=spec):
+                labels = [seg['segment'] for seg in top]
+                x = np.arange(len(labels))
+                series = [('Rows', [seg['row_share'] for seg in top])] + [
+                    (m, [seg['measures'][m]['share'] for seg in top]) for m in segment['measures']
+                ]
+                width = spec['group_width'] / len(series)
+                
+                plt.figure(figsize=spec['figsize'])
+                palette = sns.color_palette(spec['palette'], len(series))
+                for k, (label, shares) in enumerate(series):
+                    plt.bar(x + (k - (len(series) - 1) / 2) * width, np.array(shares) * 100,
+                            width=width, label=label, color=palette[k])
+                plt.xticks(x, labels, rotation=spec['xtick_rotation'], ha=spec['xtick_ha'])
+                plt.ylabel(spec['ylabel'])
+                plt.title(spec['title'], fontsize=spec['title_size'], fontweight=spec['title_weight'])
+                if spec['legend']:
+                    plt.legend()
+            safe_name = name.replace(' ', '_').replace('/', '-')
+            save_chart(f'{chart_count:02d}_segment_{safe_name}.png', 'segment_bar', [name, segment], spec, draw)
+            chart_count += 1
+            
+        # 6. Scatter Plots for High Correlations
         if 'correlations' in self.analysis_results:
             for corr in self.analysis_results['correlations'][:3]: # Top 3 correlations
                 cols = corr['pair'].split(' vs ')
-                plt.figure(figsize=(10, 6))
-                sns.scatterplot(data=self.df, x=cols[0], y=cols[1], alpha=0.6)
-                plt.title(f'{cols[0]} vs {cols[1]} (Corr: {corr["value"]:.2f})', fontsize=14, fontweight='bold')
-                plt.tight_layout()
-                plt.savefig(f'{output_dir}/{chart_count:02d}_scatter_{cols[0]}_{cols[1]}.png')
-                plt.close()
+                spec = {'figsize': [10, 6], 'alpha': 0.6, 'color': None,
+                        'title': f'{cols[0]} vs {cols[1]} (Corr: {corr["value"]:.2f})', **title_style}
+                def draw(cols=cols, spec=spec):
+                    plt.figure(figsize=spec['figsize'])
+                    sns.scatterplot(data=self.df, x=cols[0], y=cols[1], alpha=spec['alpha'], color=spec['color'])
+                    plt.title(spec['title'], fontsize=spec['title_size'], fontweight=spec['title_weight'])
+                save_chart(f'{chart_count:02d}_scatter_{cols[0]}_{cols[1]}.png', 'scatter',
+                           [self.df[cols]], spec, draw)
                 chart_count += 1
 
         print(f"[✓] Generated {chart_count} charts!")
+        cache_stats = self.profile_cache.stats()
+        print(f"[*] Column profile cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+        if chart_cache:
+            self.chart_cache_stats = chart_cache.stats()
+            print(f"[*] Chart cache: {self.chart_cache_stats['hits']} hits, "
+                  f"{self.chart_cache_stats['misses']} misses, {self.chart_cache_stats['evictions']} evicted")
         return output_dir
@@ -0,0 +1,312 @@
+import json
+import os
+
+import numpy as np
+
+from backend.serializer import dumps_json
+
+SUMMARY_VERSION = 1
+SUMMARY_DIR = os.path.join('output', 'summaries')
+
+# Quantile sketch resolution (percentiles 0..100) and categorical top-k kept per column
+QUANTILE_LEVELS = np.linspace(0, 100, 101)
+TOP_K = 20
+OTHER_LABEL = '(other)'
+
+# Population Stability Index bands
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+# KS statistic bands (only applied when the KS p-value is below KS_ALPHA)
+KS_MODERATE = 0.1
+KS_SIGNIFICANT = 0.2
+KS_ALPHA = 0.05
+# Categorical columns whose top-k covers less than this share of rows are ID-like and not scored
+MIN_TOP_K_COVERAGE = 0.5
+# Correlation changes smaller than this are not reported
+CORRELATION_CHANGE = 0.1
+# Floor for empty bins so PSI stays finite
+EPSILON = 1e-6
+
+
+def build_summary(analyzer):
+    """Compact, raw-data-free summary of an analyzed dataset (moments, quantile sketches, top-k, correlations)"""
+    results = analyzer.analysis_results
+    cache = analyzer.profile_cache
+    cache.refresh()
+    summary = {
+        'version': SUMMARY_VERSION,
+        'created_at': analyzer.timestamp,
+        'source': os.path.basename(str(analyzer.data_file)),
+        'rows': results.get('basic_stats', {}).get('total_records', len(analyzer.df)),
+        'sampled': bool(analyzer.sampling_info),
+        'numeric': {},
+        'categorical': {},
+        'correlation': None
+    }
+
+    if analyzer.numeric_cols:
+        block = cache.numeric_block(analyzer.numeric_cols)
+        profile = cache.numeric_profile(analyzer.numeric_cols)
+        sketches = np.nanpercentile(block, QUANTILE_LEVELS, axis=0) if len(block) else None
+        for j, col in enumerate(analyzer.numeric_cols):
+            summary['numeric'][col] = {
+                'count': profile['count'][j],
+                'mean': profile['mean'][j],
+                'std': profile['std'][j],
+                'min': profile['min'][j],
+                'max': profile['max'][j],
+                'quantiles': sketches[:, j] if sketches is not None else []
+            }
+            # Discrete columns (flags, ratings, counts) also keep their exact value counts,
+            # which quantile sketches cannot resolve; the sketch is a cheap pre-filter
+            if sketches is not None and len(np.unique(sketches[:, j])) <= 2 * TOP_K and cache.nunique(col) <= TOP_K:
+                counts = cache.value_counts(col)
+                summary['numeric'][col]['values'] = {'values': counts.index.to_numpy(dtype=float),
+                                                     'counts': counts.to_numpy()}
+
+    for col in analyzer.categorical_cols:
+        counts = cache.value_counts(col)
+        total = int(counts.sum())
+        top = counts.head(TOP_K)
+        summary['categorical'][col] = {
+            'count': total,
+            'unique_count': len(counts),
+            'top': {str(value): int(count) for value, count in top.items()},
+            'other': total - int(top.sum())
+        }
+
+    if len(analyzer.numeric_cols) > 1:
+        corr = cache.corr(analyzer.numeric_cols)
+        summary['correlation'] = {'columns': list(corr.columns), 'matrix': corr.to_numpy()}
+
+    return summary
+
+
+def save_summary(summary, path):
+    """Persist a summary as compact JSON"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(dumps_json(summary))
+    return path
+
+
+def load_summary(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        summary = json.load(f)
+    if summary.get('version') != SUMMARY_VERSION:
+        raise ValueError(f"Unsupported summary version in {path}: {summary.get('version')}")
+    return summary
+
+
+def _sketch_cdf(quantiles):
+    """CDF of a quantile sketch as a callable: x -> P(X <= x), linear between sketch points"""
+    points = np.asarray(quantiles, dtype=float)
+    levels = QUANTILE_LEVELS / 100
+    return lambda x: np.interp(x, points, levels, left=0.0, right=1.0)
+
+
+def _psi(expected, actual):
+    expected = np.clip(np.asarray(expected, dtype=float), EPSILON, None)
+    actual = np.clip(np.asarray(actual, dtype=float), EPSILON, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def _ks_pvalue(statistic, n1, n2):
+    """Asymptotic two-sample Kolmogorov-Smirnov p-value"""
+    if not n1 or not n2 or statistic <= 0:
+        return 1.0
+    n = n1 * n2 / (n1 + n2)
+    lam = (np.sqrt(n) + 0.12 + 0.11 / np.sqrt(n)) * statistic
+    k = np.arange(1, 101)
+    p = 2 * np.sum((-1) ** (k - 1) * np.exp(-2 * k ** 2 * lam ** 2))
+    return float(min(max(p, 0.0), 1.0))
+
+
+def _status(psi, ks=None, ks_pvalue=None):
+    """Drift band from PSI and, when it is statistically meaningful, the KS statistic"""
+    ks = ks if ks is not None and ks_pvalue is not None and ks_pvalue < KS_ALPHA else 0.0
+    if psi >= PSI_SIGNIFICANT or ks >= KS_SIGNIFICANT:
+        return 'significant'
+    if psi >= PSI_MODERATE or ks >= KS_MODERATE:
+        return 'moderate'
+    return 'stable'
+
+
+def _discrete_distribution(stats):
+    """Exact (values, probabilities) of a discrete numeric column, or None"""
+    if not stats.get('values'):
+        return None
+    counts = np.asarray(stats['values']['counts'], dtype=float)
+    if not counts.sum():
+        return None
+    values = np.asarray(stats['values']['values'], dtype=float)
+    order = np.argsort(values)
+    return values[order], counts[order] / counts.sum()
+
+
+def _compare_discrete(base, cur):
+    """PSI over the distinct values and exact KS from the step CDFs"""
+    grid = np.union1d(base[0], cur[0])
+    expected = np.zeros(len(grid))
+    actual = np.zeros(len(grid))
+    expected[np.searchsorted(grid, base[0])] = base[1]
+    actual[np.searchsorted(grid, cur[0])] = cur[1]
+    ks = float(np.max(np.abs(np.cumsum(expected) - np.cumsum(actual))))
+    return _psi(expected, actual), ks
+
+
+def _compare_sketches(base_q, cur_q):
+    """PSI over baseline bins and KS from the interpolated sketch CDFs"""
+    base_cdf, cur_cdf = _sketch_cdf(base_q), _sketch_cdf(cur_q)
+
+    distinct = np.unique(base_q)
+    if len(distinct) <= 10:
+        # Few distinct values: one bin per value, split halfway between neighbours
+        inner = (distinct[:-1] + distinct[1:]) / 2
+    else:
+        # Baseline deciles
+        inner = np.unique(base_q[::10])[1:-1]
+    edges = np.concatenate([[-np.inf], inner, [np.inf]])
+    expected = np.diff(base_cdf(edges))
+    actual = np.diff(cur_cdf(edges))
+
+    # KS statistic: largest CDF gap over all sketch points
+    grid = np.union1d(base_q, cur_q)
+    ks = float(np.max(np.abs(base_cdf(grid) - cur_cdf(grid))))
+    return _psi(expected, actual), ks
+
+
+def _compare_numeric(base, cur):
+    base_q = np.asarray(base['quantiles'], dtype=float)
+    cur_q = np.asarray(cur['quantiles'], dtype=float)
+    if base_q.size == 0 or cur_q.size == 0 or np.isnan(base_q).any() or np.isnan(cur_q).any():
+        return None
+
+    base_values, cur_values = _discrete_distribution(base), _discrete_distribution(cur)
+    if base_values is not None and cur_values is not None:
+        psi, ks = _compare_discrete(base_values, cur_values)
+    else:
+        psi, ks = _compare_sketches(base_q, cur_q)
+
+    ks_pvalue = _ks_pvalue(ks, base['count'], cur['count'])
+    return {
+        'baseline_mean': base['mean'],
+        'current_mean': cur['mean'],
+        'mean_change': (cur['mean'] - base['mean']) / abs(base['mean']) if base['mean'] else None,
+        'baseline_std': base['std'],
+        'current_std': cur['std'],
+        'psi': psi,
+        'ks_statistic': ks,
+        'ks_pvalue': ks_pvalue,
+        'status': _status(psi, ks, ks_pvalue)
+    }
+
+
+def _compare_categorical(base, cur):
+    def shares(summary):
+        total = max(summary['count'], 1)
+        return {value: count / total for value, count in summary['top'].items()}
+
+    base_shares, cur_shares = shares(base), shares(cur)
+
+    # A category's share is known on a side if it is in that side's top-k, or if that
+    # side's top-k is complete (no "other" rows, so an absent category truly has share 0).
+    # Categories not known on both sides are folded into one residual bin on each side.
+    def known(category, side_shares, side):
+        return category in side_shares or not side['other']
+
+    categories = sorted(
+        c for c in set(base_shares) | set(cur_shares)
+        if known(c, base_shares, base) and known(c, cur_shares, cur)
+    )
+    expected = np.array([base_shares.get(c, 0.0) for c in categories])
+    actual = np.array([cur_shares.get(c, 0.0) for c in categories])
+    residual = (max(1.0 - expected.sum(), 0.0), max(1.0 - actual.sum(), 0.0))
+    if residual[0] > EPSILON or residual[1] > EPSILON:
+        categories.append(OTHER_LABEL)
+        expected = np.append(expected, residual[0])
+        actual = np.append(actual, residual[1])
+
+    # ID-like columns: the top-k says too little about the distribution to score
+    coverage = min(1.0 - base['other'] / max(base['count'], 1), 1.0 - cur['other'] / max(cur['count'], 1))
+    psi = _psi(expected, actual) if coverage >= MIN_TOP_K_COVERAGE else None
+
+    deltas = actual - expected
+    order = np.argsort(-np.abs(deltas), kind='stable')
+    return {
+        'psi': psi,
+        'status': _status(psi) if psi is not None else 'not scored',
+        'top_k_coverage': coverage,
+        'baseline_unique': base['unique_count'],
+        'current_unique': cur['unique_count'],
+        'new_categories': sorted(set(cur['top']) - set(base['top'])),
+        'missing_categories': sorted(set(base['top']) - set(cur['top'])),
+        'share_changes': [
+            {
+                'value': categories[i],
+                'baseline_share': float(expected[i]),
+                'current_share': float(actual[i]),
+                'change': float(deltas[i])
+            }
+            for i in order[:5]
+        ]
+    }
+
+
+def _compare_correlations(base, cur):
+    if not base or not cur:
+        return None
+    common = [col for col in base['columns'] if col in cur['columns']]
+    if len(common) < 2:
+        return None
+
+    base_idx = [base['columns'].index(col) for col in common]
+    cur_idx = [cur['columns'].index(col) for col in common]
+    base_m = np.asarray(base['matrix'], dtype=float)[np.ix_(base_idx, base_idx)]
+    cur_m = np.asarray(cur['matrix'], dtype=float)[np.ix_(cur_idx, cur_idx)]
+    delta = cur_m - base_m
+
+    rows, cols = np.triu_indices(len(common), k=1)
+    changes = delta[rows, cols]
+    valid = ~np.isnan(changes)
+    order = np.argsort(-np.abs(np.where(valid, changes, 0)), kind='stable')
+    return {
+        'max_abs_change': float(np.nanmax(np.abs(changes))) if valid.any() else None,
+        'changed_pairs': [
+            {
+                'pair': f"{common[rows[i]]} vs {common[cols[i]]}",
+                'baseline': float(base_m[rows[i], cols[i]]),
+                'current': float(cur_m[rows[i], cols[i]]),
+                'change': float(changes[i])
+            }
+            for i in order if valid[i] and abs(changes[i]) >= CORRELATION_CHANGE
+        ][:10]
+    }
+
+
+def compare_summaries(baseline, current):
+    """Drift metrics between two stored summaries - no raw data is read"""
+    numeric, categorical = {}, {}
+    for col in baseline['numeric']:
+        if col in current['numeric']:
+            result = _compare_numeric(baseline['numeric'][col], current['numeric'][col])
+            if result:
+                numeric[col] = result
+    for col in baseline['categorical']:
+        if col in current['categorical']:
+            categorical[col] = _compare_categorical(baseline['categorical'][col], current['categorical'][col])
+
+    base_cols = set(baseline['numeric']) | set(baseline['categorical'])
+    cur_cols = set(current['numeric']) | set(current['categorical'])
+    statuses = [r['status'] for r in list(numeric.values()) + list(categorical.values())]
+    return {
+        'baseline': {'source': baseline['source'], 'created_at': baseline['created_at'], 'rows': baseline['rows']},
+        'current': {'source': current['source'], 'created_at': current['created_at'], 'rows': current['rows']},
+        'added_columns': sorted(cur_cols - base_cols),
+        'removed_columns': sorted(base_cols - cur_cols),
+        'numeric': numeric,
+        'categorical': categorical,
+        'correlation': _compare_correlations(baseline.get('correlation'), current.get('correlation')),
+        'drifted_columns': statuses.count('significant'),
+        'moderate_columns': statuses.count('moderate')
+    }
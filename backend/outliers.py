@@ -0,0 +1,99 @@
+import numpy as np
+
+# Detection thresholds
+IQR_MULTIPLIER = 1.5
+ROBUST_Z_THRESHOLD = 3.5   # Iglewicz & Hoaglin modified z-score cut-off
+Z_THRESHOLD = 3.0
+
+# Scales MAD to be consistent with the standard deviation of a normal distribution
+MAD_SCALE = 0.6745
+
+
+def numeric_profile(block):
+    """Per-column statistics of a 2-D numeric block (rows x columns), computed in one vectorized pass"""
+    q1, median, q3 = np.nanpercentile(block, [25, 50, 75], axis=0)
+    return {
+        'mean': np.nanmean(block, axis=0),
+        'median': median,
+        'std': np.nanstd(block, axis=0, ddof=1),
+        'min': np.nanmin(block, axis=0),
+        'max': np.nanmax(block, axis=0),
+        'q1': q1,
+        'q3': q3,
+        'mad': np.nanmedian(np.abs(block - median), axis=0),
+        'zeros': (block == 0).sum(axis=0),
+        'count': (~np.isnan(block)).sum(axis=0)
+    }
+
+
+def detect_outliers(block, columns, profile, sample_size=10, iqr_multiplier=IQR_MULTIPLIER,
+                    robust_threshold=ROBUST_Z_THRESHOLD, z_threshold=Z_THRESHOLD, row_labels=None):
+    """Flag outliers in every column at once with IQR fences, robust (MAD) z-scores and z-scores.
+
+    `profile` must come from numeric_profile() on the same block, so quantiles, MAD,
+    mean and std are reused rather than recomputed.
+    """
+    iqr = profile['q3'] - profile['q1']
+    lower = profile['q1'] - iqr_multiplier * iqr
+    upper = profile['q3'] + iqr_multiplier * iqr
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mad = np.where(profile['mad'] > 0, profile['mad'], np.nan)
+        std = np.where(profile['std'] > 0, profile['std'], np.nan)
+        robust_z = MAD_SCALE * (block - profile['median']) / mad
+        z = (block - profile['mean']) / std
+
+    # NaN compares False, so missing values and constant columns are never flagged
+    iqr_flags = (block < lower) | (block > upper)
+    robust_flags = np.abs(robust_z) > robust_threshold
+    z_flags = np.abs(z) > z_threshold
+
+    n_rows = max(block.shape[0], 1)
+    per_column = {}
+    for j, col in enumerate(columns):
+        per_column[col] = {
+            'lower_fence': lower[j],
+            'upper_fence': upper[j],
+            'iqr_outliers': int(iqr_flags[:, j].sum()),
+            'robust_z_outliers': int(robust_flags[:, j].sum()),
+            'z_outliers': int(z_flags[:, j].sum()),
+            'iqr_share': iqr_flags[:, j].sum() / n_rows
+        }
+
+    # Sample the most extreme flagged rows, ranked by their largest |score| across columns
+    any_flags = iqr_flags | robust_flags | z_flags
+    flagged_rows = np.flatnonzero(any_flags.any(axis=1))
+    samples = []
+    if flagged_rows.size:
+        scores = np.where(np.isnan(robust_z), z, robust_z)
+        scores = np.where(any_flags, np.abs(scores), -np.inf)[flagged_rows]
+        scores = np.nan_to_num(scores, nan=-np.inf)
+        worst_col = scores.argmax(axis=1)
+        worst_score = scores[np.arange(len(flagged_rows)), worst_col]
+        take = min(sample_size, len(flagged_rows))
+        top = np.argpartition(-worst_score, take - 1)[:take]
+        top = top[np.argsort(-worst_score[top], kind='stable')]
+        for i in top:
+            row, j = flagged_rows[i], worst_col[i]
+            samples.append({
+                'row': row_labels[row] if row_labels is not None else int(row),
+                'column': columns[j],
+                'value': block[row, j],
+                'score': worst_score[i] if np.isfinite(worst_score[i]) else None
+            })
+
+    return {
+        'columns': per_column,
+        'rows_flagged': {
+            'iqr': int(iqr_flags.any(axis=1).sum()),
+            'robust_z': int(robust_flags.any(axis=1).sum()),
+            'z': int(z_flags.any(axis=1).sum()),
+            'any': int(flagged_rows.size)
+        },
+        'thresholds': {
+            'iqr_multiplier': iqr_multiplier,
+            'robust_z': robust_threshold,
+            'z': z_threshold
+        },
+        'samples': samples
+    }
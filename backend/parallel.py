@@ -0,0 +1,107 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from backend.outliers import numeric_profile
+
+
+def _attach(name, shape, dtype):
+    """Attach to a shared block and view it as a column-major 2-D array (no copy)"""
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf, order='F')
+
+
+def _numeric_shard(name, shape, start, stop):
+    """Worker: numeric profile of columns [start, stop) read straight from shared memory"""
+    shm, block = _attach(name, shape, np.float64)
+    try:
+        profile = numeric_profile(block[:, start:stop])
+        return start, {key: np.asarray(value) for key, value in profile.items()}
+    finally:
+        del block
+        shm.close()
+
+
+def _categorical_shard(name, shape, start, stop, top_k):
+    """Worker: unique count and top-k code frequencies for columns [start, stop)"""
+    shm, codes = _attach(name, shape, np.int32)
+    try:
+        results = []
+        for j in range(start, stop):
+            column = codes[:, j]
+            counts = np.bincount(column[column >= 0])
+            take = min(top_k, len(counts))
+            top = np.argsort(-counts, kind='stable')[:take]
+            results.append((j, int((counts > 0).sum()), top, counts[top]))
+        return results
+    finally:
+        del codes
+        shm.close()
+
+
+def _to_shared(array, dtype):
+    """Copy an array into a new shared memory block in column-major order"""
+    shm = shared_memory.SharedMemory(create=True, size=max(array.size * np.dtype(dtype).itemsize, 1))
+    shared = np.ndarray(array.shape, dtype=dtype, buffer=shm.buf, order='F')
+    shared[...] = array
+    del shared
+    return shm
+
+
+def _shards(n_columns, workers):
+    bounds = np.linspace(0, n_columns, min(workers, n_columns) + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def analyze_columns_parallel(numeric_block, factorized, workers, top_k=10):
+    """Profile numeric and categorical columns across a process pool.
+
+    numeric_block: 2-D float array (rows x numeric columns)
+    factorized: list of (codes, uniques) per categorical column
+
+    Both are placed in multiprocessing.shared_memory once; workers attach by name and
+    read their shard of columns zero-copy, returning only small per-column summaries.
+    Returns (numeric profile dict of arrays, list of per-column categorical summaries).
+    """
+    blocks = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            numeric_futures = []
+            if numeric_block is not None and numeric_block.shape[1]:
+                shm = _to_shared(numeric_block, np.float64)
+                blocks.append(shm)
+                numeric_futures = [
+                    pool.submit(_numeric_shard, shm.name, numeric_block.shape, start, stop)
+                    for start, stop in _shards(numeric_block.shape[1], workers)
+                ]
+
+            categorical_futures = []
+            if factorized:
+                codes = np.column_stack([column_codes for column_codes, _ in factorized])
+                shm = _to_shared(codes, np.int32)
+                blocks.append(shm)
+                categorical_futures = [
+                    pool.submit(_categorical_shard, shm.name, codes.shape, start, stop, top_k)
+                    for start, stop in _shards(codes.shape[1], workers)
+                ]
+
+            # Merge shards back in column order
+            profile = None
+            shards = sorted((future.result() for future in numeric_futures), key=lambda shard: shard[0])
+            if shards:
+                profile = {key: np.concatenate([part[key] for _, part in shards]) for key in shards[0][1]}
+
+            categorical = [None] * len(factorized)
+            for future in categorical_futures:
+                for j, unique_count, top_codes, top_counts in future.result():
+                    uniques = factorized[j][1]
+                    categorical[j] = {
+                        'unique_count': unique_count,
+                        'top_values': dict(zip(np.asarray(uniques)[top_codes].tolist(), top_counts.tolist()))
+                    }
+            return profile, categorical
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
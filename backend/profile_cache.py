@@ -0,0 +1,140 @@
+import hashlib
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from backend.outliers import numeric_profile
+
+
+class ColumnProfileCache:
+    """Memoized per-column profiles shared by every analysis method and chart.
+
+    Entries (factorized codes, value counts, null masks, sort orders, the numeric
+    block/profile and correlation matrices) are computed on first use. The cache is
+    dropped when the frame's identity, shape, columns or dtypes change. In-place edits
+    that keep all of those (e.g. fillna or scaling a column) are caught by refresh(),
+    which compares a content digest of every cached column; call it before each pass
+    over the data, or invalidate(column) right after editing.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.hits = Counter()
+        self.misses = Counter()
+        self._entries = {}
+        self._digests = {}
+        self._fingerprint = self._compute_fingerprint()
+
+    def _compute_fingerprint(self):
+        return (id(self.df), self.df.shape, tuple(self.df.columns), tuple(str(t) for t in self.df.dtypes))
+
+    def _column_digest(self, col):
+        """Content hash of one column (values and their order)"""
+        hashes = pd.util.hash_pandas_object(self.df[col], index=False).to_numpy()
+        return hashlib.blake2b(hashes.tobytes(), digest_size=16).digest()
+
+    def _get(self, kind, key, compute):
+        fingerprint = self._compute_fingerprint()
+        if fingerprint != self._fingerprint:
+            self._entries.clear()
+            self._digests.clear()
+            self._fingerprint = fingerprint
+
+        entry_key = (kind, key)
+        if entry_key in self._entries:
+            self.hits[kind] += 1
+            return self._entries[entry_key]
+
+        self.misses[kind] += 1
+        value = compute()
+        self._entries[entry_key] = value
+        # Remember what the columns held so refresh() can detect later in-place edits
+        for col in (key if isinstance(key, tuple) else (key,)):
+            if col not in self._digests:
+                self._digests[col] = self._column_digest(col)
+        return value
+
+    def prime(self, kind, key, value):
+        """Store a value computed elsewhere (e.g. by worker processes) as a cache entry"""
+        self._get(kind, key, lambda: value)
+
+    def invalidate(self, column=None):
+        """Drop every entry, or only those that depend on `column`"""
+        if column is None:
+            self._entries.clear()
+            self._digests.clear()
+            return
+        self._digests.pop(column, None)
+        for kind, key in list(self._entries):
+            columns = key if isinstance(key, tuple) else (key,)
+            if column in columns:
+                del self._entries[(kind, key)]
+
+    def refresh(self):
+        """Invalidate entries whose columns were edited in place since they were cached; returns those columns"""
+        if self._compute_fingerprint() != self._fingerprint:
+            self.invalidate()
+            self._fingerprint = self._compute_fingerprint()
+            return list(self.df.columns)
+        changed = [col for col, digest in list(self._digests.items())
+                   if self._column_digest(col) != digest]
+        for col in changed:
+            self.invalidate(col)
+        return changed
+
+    def reset(self, df):
+        """Point the cache at a new frame"""
+        self.df = df
+        self._entries.clear()
+        self._digests.clear()
+        self._fingerprint = self._compute_fingerprint()
+
+    def factorize(self, col):
+        """(codes, uniques) with -1 for missing values, uniques in order of first appearance"""
+        return self._get('factorize', col, lambda: pd.factorize(self.df[col], sort=False))
+
+    def value_counts(self, col):
+        """Value counts (missing excluded, descending) derived from the cached factorization"""
+        def compute():
+            codes, uniques = self.factorize(col)
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            order = np.argsort(-counts, kind='stable')
+            return pd.Series(counts[order], index=pd.Index(uniques).take(order), name='count')
+        return self._get('value_counts', col, compute)
+
+    def nunique(self, col):
+        return len(self.value_counts(col))
+
+    def null_mask(self, col):
+        return self._get('null_mask', col, lambda: self.df[col].isna().to_numpy())
+
+    def null_count(self, col):
+        return int(self.null_mask(col).sum())
+
+    def sorted_order(self, col):
+        """Row positions that sort `col` ascending (used instead of copying the frame with sort_values)"""
+        return self._get('sorted_order', col,
+                         lambda: np.argsort(self.df[col].to_numpy(), kind='stable'))
+
+    def numeric_block(self, cols):
+        """2-D float array of the given numeric columns"""
+        return self._get('numeric_block', tuple(cols),
+                         lambda: self.df[list(cols)].to_numpy(dtype=float, na_value=np.nan))
+
+    def numeric_profile(self, cols):
+        """Moments, quartiles and MAD for the given numeric columns in one vectorized pass"""
+        return self._get('numeric_profile', tuple(cols), lambda: numeric_profile(self.numeric_block(cols)))
+
+    def corr(self, cols):
+        """Pearson correlation matrix of the given numeric columns"""
+        return self._get('corr', tuple(cols), lambda: self.df[list(cols)].corr())
+
+    def stats(self):
+        """Hit/miss counters per entry kind"""
+        kinds = sorted(set(self.hits) | set(self.misses))
+        return {
+            'hits': sum(self.hits.values()),
+            'misses': sum(self.misses.values()),
+            'by_kind': {kind: {'hits': self.hits[kind], 'misses': self.misses[kind]} for kind in kinds}
+        }
@@ -0,0 +1,140 @@
+import bz2
+import gzip
+import io
+import lzma
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency, only needed for Parquet/Arrow input
+    pa = pa_ipc = pq = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, only needed for .zst input
+    zstandard = None
+
+# Rows per chunk when streaming (matches performance.chunk_size in data/config.json)
+DEFAULT_CHUNK_SIZE = 10000
+
+# Magic bytes at the start of the file -> (format, compression)
+MAGIC_NUMBERS = [
+    (b'PAR1', ('parquet', None)),
+    (b'ARROW1', ('arrow', None)),
+    (b'\xff\xff\xff\xff', ('arrow_stream', None)),
+    (b'\x1f\x8b', ('csv', 'gzip')),
+    (b'\x28\xb5\x2f\xfd', ('csv', 'zstd')),
+    (b'BZh', ('csv', 'bz2')),
+    (b'\xfd7zXZ\x00', ('csv', 'xz')),
+]
+
+
+def detect_format(path):
+    """Detect (format, compression) from the file's magic bytes; plain CSV is the fallback"""
+    with open(path, 'rb') as f:
+        header = f.read(8)
+
+    for magic, detected in MAGIC_NUMBERS:
+        if header.startswith(magic):
+            return detected
+    return 'csv', None
+
+
+def _require_pyarrow(fmt):
+    if pa is None:
+        raise ImportError(f"Reading {fmt} files requires the 'pyarrow' package (pip install pyarrow)")
+
+
+def _column_filter(columns):
+    """Build a usecols callable that matches header names after whitespace stripping"""
+    if columns is None:
+        return None
+    wanted = {str(col).strip() for col in columns}
+    return lambda name: str(name).strip() in wanted
+
+
+def _project(schema_names, columns):
+    """Resolve requested column names against a columnar schema (ignoring surrounding whitespace)"""
+    if columns is None:
+        return None
+    wanted = {str(col).strip() for col in columns}
+    return [name for name in schema_names if str(name).strip() in wanted]
+
+
+def _open_decompressed(path, compression):
+    """Open a binary stream that decompresses on the fly - nothing is written to disk"""
+    if compression == 'gzip':
+        return gzip.open(path, 'rb')
+    if compression == 'bz2':
+        return bz2.open(path, 'rb')
+    if compression == 'xz':
+        return lzma.open(path, 'rb')
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("Reading .zst files requires the 'zstandard' package (pip install zstandard)")
+        raw = open(path, 'rb')
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+    return open(path, 'rb')
+
+
+def _open_arrow_reader(path, fmt):
+    source = pa.memory_map(path, 'r')
+    if fmt == 'arrow':
+        return pa_ipc.open_file(source)
+    return pa_ipc.open_stream(source)
+
+
+def iter_chunks(path, columns=None, chunksize=DEFAULT_CHUNK_SIZE):
+    """Yield the file as DataFrame chunks, reading only the requested columns"""
+    fmt, compression = detect_format(path)
+
+    if fmt == 'parquet':
+        _require_pyarrow('Parquet')
+        parquet_file = pq.ParquetFile(path)
+        projection = _project(parquet_file.schema_arrow.names, columns)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=projection):
+            yield batch.to_pandas()
+        return
+
+    if fmt in ('arrow', 'arrow_stream'):
+        _require_pyarrow('Arrow IPC')
+        reader = _open_arrow_reader(path, fmt)
+        projection = _project(reader.schema.names, columns)
+        if fmt == 'arrow':
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        else:
+            batches = iter(reader)
+        for batch in batches:
+            if projection is not None:
+                batch = batch.select(projection)
+            yield batch.to_pandas()
+        return
+
+    with _open_decompressed(path, compression) as stream:
+        for chunk in pd.read_csv(stream, usecols=_column_filter(columns), chunksize=chunksize):
+            yield chunk
+
+
+def read_table(path, columns=None):
+    """Read a whole CSV/compressed CSV/Parquet/Arrow file into a DataFrame"""
+    fmt, compression = detect_format(path)
+
+    if fmt == 'parquet':
+        _require_pyarrow('Parquet')
+        names = pq.read_schema(path).names
+        return pq.read_table(path, columns=_project(names, columns)).to_pandas()
+
+    if fmt in ('arrow', 'arrow_stream'):
+        _require_pyarrow('Arrow IPC')
+        table = _open_arrow_reader(path, fmt).read_all()
+        projection = _project(table.schema.names, columns)
+        if projection is not None:
+            table = table.select(projection)
+        return table.to_pandas()
+
+    # Compressed CSVs are decompressed as a stream straight into the parser
+    with _open_decompressed(path, compression) as stream:
+        return pd.read_csv(stream, usecols=_column_filter(columns))
@@ -140,6 +140,74 @@ class PDFReportGenerator:
         self.story.append(Paragraph(summary_text, self.styles['CustomBody']))
         self.story.append(Spacer(1, 0.3*inch))
     
+    def add_sampling_summary(self, analysis_results):
+        """Add preview sampling notice with confidence intervals (preview reports only)"""
+        if 'sampling' not in analysis_results:
+            return
+        
+        sampling = analysis_results['sampling']
+        self.story.append(Paragraph("Preview Sampling Summary", self.styles['CustomHeading']))
+        
+        notice_text = f"""
+        <b>This is a preview report.</b> Statistics and charts were computed from a random sample of
+        <b>{sampling['sample_size']:,}</b> out of <b>{sampling['population_size']:,}</b> rows
+        ({sampling['sampling_fraction']:.1%}) using {sampling['method']} sampling
+        in {sampling['elapsed_seconds']:.1f} seconds.<br/>
+        """
+        if sampling.get('strata_column'):
+            notice_text += f"Estimates are post-stratified on <b>{sampling['strata_column']}</b>.<br/>"
+        if sampling.get('truncated'):
+            notice_text += ("<b>Note:</b> reading stopped at the time budget, so estimates describe only "
+                            "the rows read so far.<br/>")
+        notice_text += ("Counts in the following sections refer to the sample. "
+                        "Generate the full report for exact figures.")
+        self.story.append(Paragraph(notice_text, self.styles['CustomBody']))
+        
+        mean_ci = sampling.get('mean_ci', {})
+        if mean_ci:
+            table_data = [['Column', 'Estimated Mean', '95% CI Low', '95% CI High']]
+            for col, ci in list(mean_ci.items())[:20]:
+                table_data.append([
+                    col[:20],
+                    f"{ci['estimate']:.2f}",
+                    f"{ci['ci_low']:.2f}",
+                    f"{ci['ci_high']:.2f}"
+                ])
+            t = Table(table_data, colWidths=[2*inch, 1.5*inch, 1.5*inch, 1.5*inch])
+            t.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f39c12')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#ecf0f1')])
+            ]))
+            self.story.append(t)
+            self.story.append(Spacer(1, 0.2*inch))
+        
+        share_ci = sampling.get('share_ci', {})
+        if share_ci:
+            table_data = [['Column', 'Value', 'Share', '95% CI']]
+            for col, values in list(share_ci.items())[:3]:
+                for val, ci in values.items():
+                    table_data.append([
+                        col[:20],
+                        str(val)[:25],
+                        f"{ci['share']:.1%}",
+                        f"{ci['ci_low']:.1%} - {ci['ci_high']:.1%}"
+                    ])
+            t = Table(table_data, colWidths=[1.8*inch, 2.2*inch, 1*inch, 1.6*inch])
+            t.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f39c12')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ]))
+            self.story.append(t)
+        
+        self.story.append(PageBreak())
+    
     def add_numeric_analysis(self, analysis_results):
         """Add numeric analysis section"""
         if 'numeric_analysis' not in analysis_results:
@@ -182,6 +250,79 @@ class PDFReportGenerator:
         self.story.append(t)
         self.story.append(PageBreak())
 
+    def add_outlier_analysis(self, analysis_results):
+        """Add outlier detection section (IQR fences, robust z-score, z-score)"""
+        if 'outliers' not in analysis_results:
+            return
+
+        outliers = analysis_results['outliers']
+        thresholds = outliers['thresholds']
+        rows_flagged = outliers['rows_flagged']
+        if 'sampling' in analysis_results:
+            # Flags are counted on the preview sample, not the full population
+            screened = f"out of {analysis_results['sampling']['sample_size']:,} sampled records"
+        else:
+            screened = f"out of {analysis_results.get('basic_stats', {}).get('total_records', 0):,} records"
+        
+        self.story.append(Paragraph("Outlier Detection", self.styles['CustomHeading']))
+        
+        intro_text = f"""
+        Every numeric column was screened with three complementary rules:
+        values outside the <b>IQR fences</b> (Q1/Q3 ± {thresholds['iqr_multiplier']} × IQR),
+        a <b>robust z-score</b> (based on the median absolute deviation) above {thresholds['robust_z']},
+        and a classic <b>z-score</b> above {thresholds['z']}.<br/>
+        Rows flagged by any rule: <b>{rows_flagged['any']:,}</b>
+        (IQR: {rows_flagged['iqr']:,}, robust z: {rows_flagged['robust_z']:,}, z-score: {rows_flagged['z']:,})
+        {screened}.
+        """
+        self.story.append(Paragraph(intro_text, self.styles['CustomBody']))
+        
+        table_data = [['Column', 'Lower Fence', 'Upper Fence', 'IQR', 'Robust Z', 'Z-Score', '% (IQR)']]
+        for col, stats in list(outliers['columns'].items())[:20]:
+            table_data.append([
+                col[:20],
+                f"{stats['lower_fence']:.2f}",
+                f"{stats['upper_fence']:.2f}",
+                f"{stats['iqr_outliers']:,}",
+                f"{stats['robust_z_outliers']:,}",
+                f"{stats['z_outliers']:,}",
+                f"{stats['iqr_share']:.1%}"
+            ])
+        
+        t = Table(table_data, colWidths=[1.7*inch, 1.1*inch, 1.1*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch])
+        t.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#d35400')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#ecf0f1')])
+        ]))
+        self.story.append(t)
+        
+        if outliers['samples']:
+            self.story.append(Spacer(1, 0.2*inch))
+            self.story.append(Paragraph("<b>Most extreme flagged rows:</b>", self.styles['Normal']))
+            
+            # Row numbers refer to the source file in full and preview reports alike
+            sample_data = [['Source Row', 'Column', 'Value', 'Score']]
+            for sample in outliers['samples']:
+                score = f"{sample['score']:.2f}" if sample['score'] is not None else '-'
+                sample_data.append([str(sample['row']), sample['column'][:25], f"{sample['value']:.2f}", score])
+            
+            t = Table(sample_data, colWidths=[1*inch, 2.5*inch, 1.5*inch, 1*inch])
+            t.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#d35400')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ]))
+            self.story.append(t)
+        
+        self.story.append(PageBreak())
+
     def add_categorical_analysis(self, analysis_results):
         """Add categorical analysis section"""
         if 'categorical_analysis' not in analysis_results:
@@ -215,6 +356,140 @@ class PDFReportGenerator:
             
         self.story.append(PageBreak())
 
+    def add_segmentation_analysis(self, analysis_results):
+        """Add segmentation tables (top-N groups per segment key)"""
+        if not analysis_results.get('segmentation'):
+            return
+
+        self.story.append(Paragraph("Segmentation Analysis", self.styles['CustomHeading']))
+        
+        for name, segment in analysis_results['segmentation'].items():
+            self.story.append(Paragraph(
+                f"<b>Segments by {name}</b> ({segment['group_count']:,} groups, top {len(segment['top_segments'])} shown)",
+                self.styles['Normal']))
+            
+            measures = segment['measures'][:2] # Keep the table within page width
+            header = ['Segment', 'Rows', 'Row Share']
+            for measure in measures:
+                header += [f"{measure[:12]} Sum", f"{measure[:12]} Mean", 'Share']
+            table_data = [header]
+            
+            for seg in segment['top_segments']:
+                row = [seg['segment'][:25], f"{seg['rows']:,}", f"{seg['row_share']:.1%}"]
+                for measure in measures:
+                    stats = seg['measures'][measure]
+                    row += [f"{stats['sum']:,.2f}", f"{stats['mean']:,.2f}", f"{stats['share']:.1%}"]
+                table_data.append(row)
+            
+            col_widths = [1.8*inch, 0.7*inch, 0.7*inch] + [1.1*inch, 0.9*inch, 0.6*inch] * len(measures)
+            t = Table(table_data, colWidths=col_widths)
+            t.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#16a085')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 8),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#ecf0f1')])
+            ]))
+            self.story.append(t)
+            self.story.append(Spacer(1, 0.2*inch))
+        
+        self.story.append(PageBreak())
+
+    def add_drift_comparison(self, drift):
+        """Add drift metrics between a baseline and a current dataset summary"""
+        self.story.append(Paragraph("Dataset Drift Comparison", self.styles['CustomHeading']))
+
+        baseline, current = drift['baseline'], drift['current']
+        overview = (
+            f"Baseline: <b>{baseline['source']}</b> ({baseline['rows']:,} records, {baseline['created_at']}). "
+            f"Current: <b>{current['source']}</b> ({current['rows']:,} records, {current['created_at']}). "
+            f"{drift['drifted_columns']} column(s) show significant drift (PSI 0.25 or more, or a "
+            f"significant KS statistic of 0.2 or more) and {drift['moderate_columns']} moderate drift "
+            "(PSI 0.1-0.25, or KS 0.1-0.2). "
+            "Metrics are computed from stored quantile sketches, value counts and top-k category shares, "
+            "so the raw data is not re-read. Categorical columns whose top categories cover less than "
+            "half of the rows (e.g. identifiers) are not scored."
+        )
+        if drift['added_columns']:
+            overview += f" New columns: {', '.join(drift['added_columns'][:10])}."
+        if drift['removed_columns']:
+            overview += f" Removed columns: {', '.join(drift['removed_columns'][:10])}."
+        self.story.append(Paragraph(overview, self.styles['CustomBody']))
+
+        table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#d35400')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#ecf0f1')])
+        ])
+
+        if drift['numeric']:
+            self.story.append(Paragraph("<b>Numeric Columns</b>", self.styles['Normal']))
+            table_data = [['Column', 'Baseline Mean', 'Current Mean', 'Change', 'PSI', 'KS', 'KS p-value', 'Status']]
+            for col, stats in sorted(drift['numeric'].items(), key=lambda item: -item[1]['psi']):
+                change = f"{stats['mean_change']:+.1%}" if stats['mean_change'] is not None else 'N/A'
+                table_data.append([
+                    col[:20],
+                    f"{stats['baseline_mean']:,.2f}",
+                    f"{stats['current_mean']:,.2f}",
+                    change,
+                    f"{stats['psi']:.3f}",
+                    f"{stats['ks_statistic']:.3f}",
+                    f"{stats['ks_pvalue']:.3f}",
+                    stats['status'].title()
+                ])
+            t = Table(table_data, colWidths=[1.4*inch, 1*inch, 1*inch, 0.7*inch, 0.6*inch, 0.6*inch, 0.7*inch, 0.8*inch])
+            t.setStyle(table_style)
+            self.story.append(t)
+            self.story.append(Spacer(1, 0.2*inch))
+
+        if drift['categorical']:
+            self.story.append(Paragraph("<b>Categorical Columns</b>", self.styles['Normal']))
+            table_data = [['Column', 'PSI', 'Status', 'Largest Share Change', 'Baseline', 'Current']]
+            by_psi = lambda item: -item[1]['psi'] if item[1]['psi'] is not None else 1
+            for col, stats in sorted(drift['categorical'].items(), key=by_psi):
+                top = stats['share_changes'][0] if stats['share_changes'] else None
+                table_data.append([
+                    col[:20],
+                    f"{stats['psi']:.3f}" if stats['psi'] is not None else 'N/A',
+                    stats['status'].title(),
+                    str(top['value'])[:25] if top else 'N/A',
+                    f"{top['baseline_share']:.1%}" if top else 'N/A',
+                    f"{top['current_share']:.1%}" if top else 'N/A'
+                ])
+            t = Table(table_data, colWidths=[1.4*inch, 0.6*inch, 0.8*inch, 1.9*inch, 0.8*inch, 0.8*inch])
+            t.setStyle(table_style)
+            self.story.append(t)
+            self.story.append(Spacer(1, 0.2*inch))
+
+        correlation = drift.get('correlation')
+        if correlation and correlation['changed_pairs']:
+            self.story.append(Paragraph("<b>Correlation Changes</b>", self.styles['Normal']))
+            table_data = [['Variable Pair', 'Baseline', 'Current', 'Change']]
+            for pair in correlation['changed_pairs']:
+                table_data.append([
+                    pair['pair'][:45],
+                    f"{pair['baseline']:.3f}",
+                    f"{pair['current']:.3f}",
+                    f"{pair['change']:+.3f}"
+                ])
+            t = Table(table_data, colWidths=[3.2*inch, 1*inch, 1*inch, 1*inch])
+            t.setStyle(table_style)
+            self.story.append(t)
+        elif correlation:
+            self.story.append(Paragraph(
+                f"No correlation changed by 0.1 or more (largest change: {correlation['max_abs_change'] or 0:.3f}).",
+                self.styles['CustomBody']))
+
+        self.story.append(PageBreak())
+
     def add_correlations(self, analysis_results):
         """Add correlation analysis"""
         if 'correlations' not in analysis_results:
@@ -287,13 +562,14 @@ class PDFReportGenerator:
         Please review the Executive Summary for details on missing values or duplicates.<br/><br/>
         
         2. <b>Statistical Trends:</b> The Numeric Analysis section highlights the central tendencies and spread of your data.
-        Outliers or extreme values can be identified from the Min/Max values.<br/><br/>
+        Outliers and extreme values are listed in the Outlier Detection section.<br/><br/>
         
         3. <b>Relationships:</b> The Correlation Analysis (if applicable) has identified potential relationships between variables.
         Strong correlations (close to 1 or -1) suggest predictive power.<br/><br/>
         
         <b>Recommendations:</b><br/>
         • Investigate any high correlation pairs to understand causal relationships.<br/>
+        • Check flagged outliers for data-entry errors before relying on averages.<br/>
         • Review categorical distributions to identify dominant groups or rare classes.<br/>
         • Use the generated visualizations to present findings to stakeholders.<br/>
         """
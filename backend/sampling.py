@@ -0,0 +1,155 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.readers import DEFAULT_CHUNK_SIZE, iter_chunks
+
+# Default preview budget: rows kept in the sample / seconds spent reading
+PREVIEW_ROW_BUDGET = 50000
+PREVIEW_TIME_BUDGET = None
+
+# z-value for 95% confidence intervals
+Z_95 = 1.959963984540054
+
+# Strata need enough rows per level to estimate within-stratum variance
+MAX_STRATA = 20
+
+
+def choose_strata_column(chunk):
+    """Pick the dominant low-cardinality categorical column to stratify on (fewest levels wins)"""
+    best, best_levels = None, None
+    for col in chunk.select_dtypes(include=['object', 'category']).columns:
+        levels = chunk[col].nunique()
+        if 2 <= levels <= MAX_STRATA and (best_levels is None or levels < best_levels):
+            best, best_levels = col, levels
+    return best
+
+
+def reservoir_sample(data_file, columns=None, row_budget=PREVIEW_ROW_BUDGET,
+                     time_budget=PREVIEW_TIME_BUDGET, seed=None):
+    """Stream a file and keep a uniform random sample of at most `row_budget` rows.
+
+    Vectorized reservoir: every row gets a uniform random key and the rows with the
+    smallest keys are kept. Once the reservoir is full, only rows whose key beats the
+    current threshold are considered, so late chunks cost almost nothing. Exact
+    per-level counts of the dominant categorical are tallied for post-stratification.
+    Reading stops early once `time_budget` seconds have elapsed.
+    """
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+
+    sample, keys = None, np.empty(0)
+    rows_scanned = 0
+    strata_col = None
+    strata_counts = pd.Series(dtype='int64')
+    truncated = False
+
+    chunksize = max(DEFAULT_CHUNK_SIZE, min(row_budget, DEFAULT_CHUNK_SIZE * 10))
+    for chunk in iter_chunks(data_file, columns=columns, chunksize=chunksize):
+        chunk.columns = [str(col).strip() for col in chunk.columns]
+        if sample is None:
+            strata_col = choose_strata_column(chunk)
+
+        # Label rows with their position in the source so sampled rows stay traceable
+        chunk.index = pd.RangeIndex(rows_scanned, rows_scanned + len(chunk))
+        rows_scanned += len(chunk)
+        if strata_col is not None:
+            strata_counts = strata_counts.add(chunk[strata_col].value_counts(dropna=False), fill_value=0)
+
+        chunk_keys = rng.random(len(chunk))
+        if sample is not None and len(sample) >= row_budget:
+            # Reservoir full: only rows that would displace a current member can enter
+            mask = chunk_keys < keys.max()
+            chunk, chunk_keys = chunk[mask], chunk_keys[mask]
+
+        if len(chunk):
+            sample = chunk if sample is None else pd.concat([sample, chunk])
+            keys = np.concatenate([keys, chunk_keys])
+            if len(sample) > row_budget:
+                keep = np.argpartition(keys, row_budget - 1)[:row_budget]
+                sample, keys = sample.iloc[keep], keys[keep]
+
+        if time_budget is not None and time.perf_counter() - start > time_budget:
+            truncated = True
+            break
+
+    if sample is None:
+        sample = pd.DataFrame()
+    else:
+        sample = sample.sort_index()  # Back to source order
+
+    info = {
+        'method': 'reservoir' if strata_col is None else 'reservoir (post-stratified)',
+        'sample_size': len(sample),
+        'population_size': rows_scanned,
+        'sampling_fraction': len(sample) / rows_scanned if rows_scanned else 1.0,
+        'strata_column': strata_col,
+        'strata_counts': {k: int(v) for k, v in strata_counts.items()},
+        'truncated': truncated,
+        'elapsed_seconds': time.perf_counter() - start,
+        'row_budget': row_budget,
+        'time_budget': time_budget
+    }
+    return sample, info
+
+
+def mean_confidence_intervals(sample, numeric_cols, info, z=Z_95):
+    """95% CIs for column means: post-stratified when strata are known, simple random otherwise"""
+    n = info['sample_size']
+    N = info['population_size']
+    fpc = max(1.0 - n / N, 0.0) if N else 0.0
+    strata_col = info.get('strata_column')
+    strata_counts = pd.Series(info.get('strata_counts', {}), dtype='float64')
+
+    intervals = {}
+    for col in numeric_cols:
+        values = sample[col]
+        estimate, variance = None, None
+
+        if strata_col is not None and strata_col in sample and not strata_counts.empty:
+            grouped = values.groupby(sample[strata_col], dropna=False).agg(['mean', 'var', 'count'])
+            grouped = grouped.reindex(strata_counts.index)
+            # Post-stratification needs >=2 sampled rows in every populated stratum
+            if (grouped['count'] >= 2).all():
+                weights = strata_counts / strata_counts.sum()
+                estimate = float((weights * grouped['mean']).sum())
+                s2 = grouped['var'].fillna(0.0)
+                variance = float(fpc * ((weights * s2).sum() / n + ((1 - weights) * s2).sum() / n ** 2))
+
+        if estimate is None:
+            count = values.count()
+            if count == 0:
+                continue
+            estimate = float(values.mean())
+            variance = float(fpc * values.var() / count) if count > 1 else 0.0
+
+        margin = z * np.sqrt(variance)
+        intervals[col] = {
+            'estimate': estimate,
+            'ci_low': estimate - margin,
+            'ci_high': estimate + margin,
+            'margin': margin
+        }
+    return intervals
+
+
+def share_confidence_intervals(sample, categorical_cols, info, top_n=5, z=Z_95):
+    """95% CIs for the population share of each column's most frequent values"""
+    n = info['sample_size']
+    N = info['population_size']
+    fpc = max(1.0 - n / N, 0.0) if N else 0.0
+
+    intervals = {}
+    for col in categorical_cols:
+        shares = sample[col].value_counts(normalize=True).head(top_n)
+        margins = z * np.sqrt(fpc * shares * (1 - shares) / max(n, 1))
+        intervals[col] = {
+            str(value): {
+                'share': float(share),
+                'ci_low': float(max(share - margin, 0.0)),
+                'ci_high': float(min(share + margin, 1.0))
+            }
+            for (value, share), margin in zip(shares.items(), margins)
+        }
+    return intervals
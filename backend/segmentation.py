@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+
+from backend.readers import DEFAULT_CHUNK_SIZE, iter_chunks
+
+MISSING_LABEL = '(missing)'
+SEGMENT_SEPARATOR = ' / '
+
+# Auto-selected segment keys must have a manageable number of groups
+MAX_SEGMENT_LEVELS = 50
+# Numeric columns whose names contain these tokens are identifiers, not measures
+IDENTIFIER_TOKENS = ('id', 'code', 'zip', 'postal', 'index')
+
+
+def default_segment_keys(categorical_cols, nunique, limit=3):
+    """Categorical columns with 2..MAX_SEGMENT_LEVELS levels, most coarse-grained first"""
+    levels = {col: nunique(col) for col in categorical_cols}
+    keys = [col for col in categorical_cols if 2 <= levels[col] <= MAX_SEGMENT_LEVELS]
+    return sorted(keys, key=lambda col: levels[col])[:limit]
+
+
+def default_measures(numeric_cols, limit=3):
+    """Numeric columns that look like quantities rather than identifiers"""
+    measures = []
+    for col in numeric_cols:
+        tokens = str(col).lower().replace('_', ' ').replace('-', ' ').split()
+        if not any(token in IDENTIFIER_TOKENS for token in tokens):
+            measures.append(col)
+    return measures[:limit]
+
+
+def _factorize_groups(frame, keys):
+    """Vectorized multi-key factorization: returns (group ids per row, unique key values per key)"""
+    group_ids = np.zeros(len(frame), dtype=np.int64)
+    n_groups = 1
+    for key in keys:
+        codes, _ = pd.factorize(frame[key], sort=False)
+        # Combine with previous keys and re-compress so ids stay < n_rows (no overflow)
+        group_ids, _ = pd.factorize(group_ids * (codes.max() + 1 if len(codes) else 1) + codes, sort=False)
+        n_groups = int(group_ids.max()) + 1 if len(group_ids) else 0
+
+    # First row of each group gives its key values
+    first_rows = np.full(n_groups, -1, dtype=np.int64)
+    first_rows[group_ids[::-1]] = np.arange(len(group_ids) - 1, -1, -1)
+    uniques = [frame[key].to_numpy()[first_rows] for key in keys]
+    return group_ids, n_groups, uniques
+
+
+class SegmentationEngine:
+    """Group-by aggregation of numeric measures over categorical keys.
+
+    Rows are factorized into integer group ids and aggregated with np.bincount, so
+    there is no Python loop per group. Chunks can be fed one at a time: each chunk's
+    groups are matched against the running group index and accumulated, making the
+    engine usable for in-memory frames and streamed files alike.
+    """
+
+    def __init__(self, keys, measures):
+        self.keys = list(keys)
+        self.measures = list(measures)
+        self._groups = None
+        self._rows = np.zeros(0, dtype=np.int64)
+        self._sums = np.zeros((len(self.measures), 0))
+        self._counts = np.zeros((len(self.measures), 0), dtype=np.int64)
+
+    def update(self, frame):
+        """Accumulate one DataFrame (or chunk) into the running aggregates"""
+        if frame.empty:
+            return self
+
+        key_frame = frame[self.keys].astype(object).where(frame[self.keys].notna(), MISSING_LABEL)
+        local_ids, n_local, local_uniques = _factorize_groups(key_frame, self.keys)
+
+        # Map this chunk's groups onto the global group index, appending unseen groups
+        if len(self.keys) == 1:
+            local_index = pd.Index(local_uniques[0], dtype=object)
+        else:
+            local_index = pd.MultiIndex.from_arrays(local_uniques, names=self.keys)
+        if self._groups is None:
+            self._groups = local_index
+            global_ids = np.arange(n_local)
+        else:
+            global_ids = self._groups.get_indexer(local_index)
+            new = global_ids == -1
+            if new.any():
+                global_ids[new] = np.arange(len(self._groups), len(self._groups) + int(new.sum()))
+                self._groups = self._groups.append(local_index[new])
+        self._grow(len(self._groups))
+
+        self._rows[global_ids] += np.bincount(local_ids, minlength=n_local)
+        for m, measure in enumerate(self.measures):
+            values = pd.to_numeric(frame[measure], errors='coerce').to_numpy(dtype=float)
+            valid = ~np.isnan(values)
+            self._sums[m, global_ids] += np.bincount(local_ids[valid], weights=values[valid], minlength=n_local)
+            self._counts[m, global_ids] += np.bincount(local_ids[valid], minlength=n_local)
+        return self
+
+    def _grow(self, n_groups):
+        extra = n_groups - len(self._rows)
+        if extra > 0:
+            self._rows = np.concatenate([self._rows, np.zeros(extra, dtype=np.int64)])
+            self._sums = np.hstack([self._sums, np.zeros((len(self.measures), extra))])
+            self._counts = np.hstack([self._counts, np.zeros((len(self.measures), extra), dtype=np.int64)])
+
+    def to_frame(self):
+        """All groups as a DataFrame with rows/row_share and <measure>_sum/_mean/_count/_share columns"""
+        if self._groups is None:
+            return pd.DataFrame()
+
+        data = {'rows': self._rows, 'row_share': self._rows / max(self._rows.sum(), 1)}
+        for m, measure in enumerate(self.measures):
+            sums, counts = self._sums[m], self._counts[m]
+            total = sums.sum()
+            data[f'{measure}_sum'] = sums
+            data[f'{measure}_mean'] = np.divide(sums, counts, out=np.full(len(sums), np.nan), where=counts > 0)
+            data[f'{measure}_count'] = counts
+            data[f'{measure}_share'] = sums / total if total else np.full(len(sums), np.nan)
+        return pd.DataFrame(data, index=self._groups)
+
+    def top_n(self, n=10, by=None):
+        """Top-N groups by a measure's sum (or by row count when there are no measures)"""
+        frame = self.to_frame()
+        if frame.empty:
+            return frame
+        by = by or (f'{self.measures[0]}_sum' if self.measures else 'rows')
+        values = frame[by].to_numpy(dtype=float)
+        values = np.where(np.isnan(values), -np.inf, values)
+        if len(values) > n:
+            candidates = np.argpartition(-values, n - 1)[:n]
+        else:
+            candidates = np.arange(len(values))
+        order = candidates[np.argsort(-values[candidates], kind='stable')]
+        return frame.iloc[order]
+
+    def result(self, top_n=10, by=None):
+        """Summarize as a plain dict for analysis_results"""
+        top = self.top_n(top_n, by)
+        labels = [
+            SEGMENT_SEPARATOR.join(str(v) for v in label) if isinstance(label, tuple) else str(label)
+            for label in top.index
+        ]
+        return {
+            'keys': self.keys,
+            'measures': self.measures,
+            'group_count': 0 if self._groups is None else len(self._groups),
+            'total_rows': int(self._rows.sum()),
+            'top_segments': [
+                {
+                    'segment': label,
+                    'rows': int(row['rows']),
+                    'row_share': float(row['row_share']),
+                    'measures': {
+                        measure: {
+                            'sum': float(row[f'{measure}_sum']),
+                            'mean': float(row[f'{measure}_mean']),
+                            'count': int(row[f'{measure}_count']),
+                            'share': float(row[f'{measure}_share'])
+                        }
+                        for measure in self.measures
+                    }
+                }
+                for label, (_, row) in zip(labels, top.iterrows())
+            ]
+        }
+
+
+def segment_frame(df, keys, measures, top_n=10):
+    """Segment an in-memory DataFrame"""
+    return SegmentationEngine(keys, measures).update(df).result(top_n)
+
+
+def segment_file(data_file, keys, measures, top_n=10, chunksize=DEFAULT_CHUNK_SIZE):
+    """Segment a file chunk by chunk, reading only the key and measure columns"""
+    engine = SegmentationEngine(keys, measures)
+    for chunk in iter_chunks(data_file, columns=list(keys) + list(measures), chunksize=chunksize):
+        chunk.columns = [str(col).strip() for col in chunk.columns]
+        engine.update(chunk)
+    return engine.result(top_n)
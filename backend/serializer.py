@@ -0,0 +1,90 @@
+import json
+import math
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency, only needed for MessagePack output
+    msgpack = None
+
+JSON_CONTENT_TYPE = 'application/json'
+MSGPACK_CONTENT_TYPE = 'application/msgpack'
+
+
+def to_builtin(obj):
+    """Recursively convert analysis output into plain JSON-compatible Python types"""
+    if obj is None or isinstance(obj, (str, bool)):
+        return obj
+
+    if isinstance(obj, dict):
+        return {_key_to_str(k): to_builtin(v) for k, v in obj.items()}
+
+    if isinstance(obj, (list, tuple, set)):
+        return [to_builtin(v) for v in obj]
+
+    if isinstance(obj, (np.bool_,)):
+        return bool(obj)
+
+    if isinstance(obj, (int, np.integer)):
+        return int(obj)
+
+    if isinstance(obj, (float, np.floating)):
+        value = float(obj)
+        # NaN/inf are not valid JSON - emit null instead
+        return value if math.isfinite(value) else None
+
+    if isinstance(obj, (pd.Timestamp, datetime, date)):
+        return None if pd.isna(obj) else obj.isoformat()
+
+    if isinstance(obj, pd.Timedelta):
+        return None if pd.isna(obj) else obj.total_seconds()
+
+    if isinstance(obj, pd.DataFrame):
+        return to_builtin(obj.to_dict())
+
+    if isinstance(obj, pd.Series):
+        return to_builtin(obj.to_dict())
+
+    if isinstance(obj, np.ndarray):
+        return to_builtin(obj.tolist())
+
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+
+    return str(obj)
+
+
+def _key_to_str(key):
+    """Dictionary keys must be strings in JSON (e.g. Timestamp keys from resampling)"""
+    if isinstance(key, str):
+        return key
+    if isinstance(key, (pd.Timestamp, datetime, date)):
+        return 'NaT' if pd.isna(key) else key.isoformat()
+    if isinstance(key, (np.integer, np.floating, np.bool_)):
+        return str(key.item())
+    return str(key)
+
+
+def dumps_json(data):
+    """Serialize to compact UTF-8 JSON bytes"""
+    return json.dumps(to_builtin(data), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def dumps_msgpack(data):
+    """Serialize to MessagePack bytes (requires the optional msgpack package)"""
+    if msgpack is None:
+        raise RuntimeError("MessagePack output requires the 'msgpack' package (pip install msgpack)")
+    return msgpack.packb(to_builtin(data), use_bin_type=True)
+
+
+def serialize(data, fmt='json'):
+    """Serialize data in the requested format, returning (payload, content_type)"""
+    fmt = (fmt or 'json').lower()
+    if fmt in ('msgpack', 'messagepack'):
+        return dumps_msgpack(data), MSGPACK_CONTENT_TYPE
+    if fmt == 'json':
+        return dumps_json(data), JSON_CONTENT_TYPE
+    raise ValueError(f"Unsupported serialization format: {fmt}")
@@ -6,6 +6,7 @@
 let selectedFile = null;
 let isProcessing = false;
 let recentReports = [];
+let previewSource = null; // Upload behind the last preview report, reused for the full report
 
 // Initialize Application
 document.addEventListener('DOMContentLoaded', function () {
@@ -66,8 +67,9 @@ function setupNavigation() {
 
 function handleFileSelect(file) {
     // Validate file
-    if (!file.name.endsWith('.csv')) {
-        showError('Please select a valid CSV file');
+    const supported = ['.csv', '.gz', '.zst', '.bz2', '.xz', '.parquet', '.arrow', '.feather', '.ipc'];
+    if (!supported.some(ext => file.name.toLowerCase().endsWith(ext))) {
+        showError('Please select a CSV, compressed CSV, Parquet or Arrow file');
         return;
     }
 
@@ -132,6 +134,8 @@ function resetFile() {
     document.getElementById('openBtn').disabled = true;
     const downloadBtn = document.getElementById('downloadBtn');
     if (downloadBtn) downloadBtn.disabled = true;
+    previewSource = null;
+    hideFullReportButton();
 }
 
 function enableGenerateButton() {
@@ -153,22 +157,51 @@ function generateReport() {
         return;
     }
 
+    // Create FormData
+    const formData = new FormData();
+    formData.append('file', selectedFile);
+    formData.append('title', document.getElementById('reportTitle').value);
+    formData.append('subtitle', document.getElementById('reportSubtitle').value);
+    if (document.getElementById('previewMode').checked) {
+        formData.append('preview', 'true');
+        formData.append('preview_rows', document.getElementById('previewRows').value);
+    }
+
+    submitReport(formData);
+}
+
+function generateFullReport() {
+    if (!previewSource) {
+        showInfo('Generate a preview report first');
+        return;
+    }
+
+    if (isProcessing) {
+        showError('Report generation already in progress');
+        return;
+    }
+
+    // Re-run on the already uploaded file without sampling
+    const formData = new FormData();
+    formData.append('source', previewSource);
+    formData.append('title', document.getElementById('reportTitle').value);
+    formData.append('subtitle', document.getElementById('reportSubtitle').value);
+
+    submitReport(formData);
+}
+
+function submitReport(formData) {
     isProcessing = true;
     document.getElementById('generateBtn').disabled = true;
     document.getElementById('openBtn').disabled = true;
     const downloadBtn = document.getElementById('downloadBtn');
     if (downloadBtn) downloadBtn.disabled = true;
+    hideFullReportButton();
 
     // Reset progress
     setProgress(10);
     updateStatusMessage('Uploading file and starting analysis...', 'info');
 
-    // Create FormData
-    const formData = new FormData();
-    formData.append('file', selectedFile);
-    formData.append('title', document.getElementById('reportTitle').value);
-    formData.append('subtitle', document.getElementById('reportSubtitle').value);
-
     // Start progress simulation
     let simulatedProgress = 10;
     const progressInterval = setInterval(() => {
@@ -212,6 +245,11 @@ function generateReport() {
             if (data.success) {
                 setProgress(100);
                 completeReportGeneration(data.report);
+                if (data.preview) {
+                    showFullReportButton(data.source);
+                } else {
+                    previewSource = null;
+                }
             } else {
                 throw new Error(data.error || 'Unknown error occurred');
             }
@@ -221,12 +259,25 @@ function generateReport() {
             console.error('Error:', error);
             showError('Failed to generate report: ' + error.message);
             isProcessing = false;
-            document.getElementById('generateBtn').disabled = false;
+            document.getElementById('generateBtn').disabled = !selectedFile;
+            if (previewSource) {
+                document.getElementById('fullReportBtn').style.display = 'block';
+            }
             setProgress(0);
             updateStatusMessage('Error: ' + error.message, 'error');
         });
 }
 
+function showFullReportButton(source) {
+    previewSource = source;
+    document.getElementById('fullReportBtn').style.display = 'block';
+    updateStatusMessage('✓ Preview ready - generate the full report for exact figures', 'success');
+}
+
+function hideFullReportButton() {
+    document.getElementById('fullReportBtn').style.display = 'none';
+}
+
 function setProgress(value) {
     const progressBar = document.getElementById('progressBar');
     const progressPercentage = document.getElementById('progressPercentage');
@@ -9,27 +9,50 @@ import sys
 import os
 from datetime import datetime
 from backend.data_analyzer import DataAnalyzer
+from backend.drift import SUMMARY_DIR, build_summary, compare_summaries, load_summary, save_summary
 from backend.report_generator import PDFReportGenerator
+from backend.sampling import PREVIEW_ROW_BUDGET
 
 def main():
     parser = argparse.ArgumentParser(
-        description='Generate professional PDF reports from CSV data',
+        description='Generate professional PDF reports from CSV, Parquet or Arrow data',
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
   python generate_report.py data/train.csv
   python generate_report.py data/train.csv -o output/my_report.pdf
   python generate_report.py data/train.csv -o output/my_report.pdf -c output/my_charts
+  python generate_report.py data/sales.parquet --columns "Region,Category,Sales"
+  python generate_report.py data/big.csv.gz --preview --preview-rows 20000 --time-budget 5
+  python generate_report.py data/train.csv --segment-by Region --segment-by "Region,Category" --measures Sales
+  python generate_report.py --compare output/summaries/summary_A.json output/summaries/summary_B.json
         """
     )
     
-    parser.add_argument('input_file', help='Input CSV file path')
+    parser.add_argument('input_file', nargs='?', help='Input data file (CSV, gzip/zstd-compressed CSV, Parquet or Arrow IPC)')
     parser.add_argument('-o', '--output', default=None, help='Output PDF file path (default: output/report_TIMESTAMP.pdf)')
     parser.add_argument('-c', '--charts', default=None, help='Charts directory (default: output/charts_TIMESTAMP)')
+    parser.add_argument('--columns', default=None, help='Comma-separated list of columns to analyze (others are not read)')
+    parser.add_argument('--segment-by', action='append', default=None, help='Segment key(s), comma-separated for multi-key; repeatable (default: auto)')
+    parser.add_argument('--measures', default=None, help='Comma-separated numeric measures for segmentation (default: auto)')
+    parser.add_argument('--top-n', type=int, default=10, help='Segments shown per key (default: 10)')
+    parser.add_argument('--dpi', type=int, default=100, help='Chart resolution (default: 100)')
+    parser.add_argument('--no-chart-cache', action='store_true', help='Always re-render charts instead of reusing cached images')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='Processes for per-column analysis (default: 1)')
+    parser.add_argument('--preview', action='store_true', help='Fast preview report from a random sample (with confidence intervals)')
+    parser.add_argument('--preview-rows', type=int, default=PREVIEW_ROW_BUDGET, help=f'Maximum sampled rows in preview mode (default: {PREVIEW_ROW_BUDGET})')
+    parser.add_argument('--time-budget', type=float, default=None, help='Stop reading after this many seconds in preview mode')
+    parser.add_argument('--summary', default=None, help=f'Where to store the run summary used for drift comparison (default: {SUMMARY_DIR}/summary_TIMESTAMP.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'), default=None, help='Compare two stored run summaries and report dataset drift (no raw data is read)')
     parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
     
     args = parser.parse_args()
     
+    if args.compare:
+        return compare_main(args)
+    if not args.input_file:
+        parser.error('an input file is required unless --compare is given')
+    
     # Validate input file
     if not os.path.exists(args.input_file):
         # Check in data directory
@@ -60,6 +83,8 @@ Examples:
     else:
         chart_dir = args.charts
     
+    summary_path = args.summary or os.path.join(SUMMARY_DIR, f"summary_{timestamp}.json")
+    
     print("=" * 70)
     print("🚀 INSIGHTIFY - PROFESSIONAL REPORT GENERATOR")
     print("=" * 70)
@@ -71,12 +96,17 @@ Examples:
     try:
         # Step 1: Initialize analyzer
         print("\n[1/5] Initializing data analyzer...")
-        analyzer = DataAnalyzer(args.input_file)
+        columns = [c.strip() for c in args.columns.split(',')] if args.columns else None
+        analyzer = DataAnalyzer(args.input_file, columns=columns, preview=args.preview,
+                                row_budget=args.preview_rows, time_budget=args.time_budget)
         print("      ✓ Analyzer initialized")
         
         # Step 2: Perform analysis
         print("\n[2/5] Performing comprehensive data analysis...")
-        analysis_results = analyzer.perform_analysis()
+        segment_by = [[c.strip() for c in keys.split(',')] for keys in args.segment_by] if args.segment_by else None
+        measures = [c.strip() for c in args.measures.split(',')] if args.measures else None
+        analysis_results = analyzer.perform_analysis(segment_by=segment_by, measures=measures,
+                                                     top_n=args.top_n, workers=args.workers)
         print("      ✓ Analysis completed")
         
         if args.verbose:
@@ -88,9 +118,12 @@ Examples:
             print(f"      - Unique Customers: {basic_stats['unique_customers']:,}")
             print(f"      - Unique Products: {basic_stats['unique_products']:,}")
         
+        save_summary(build_summary(analyzer), summary_path)
+        print(f"      ✓ Run summary stored for drift comparison: {summary_path}")
+        
         # Step 3: Generate visualizations
         print("\n[3/5] Generating visualizations and charts...")
-        analyzer.generate_charts(chart_dir)
+        analyzer.generate_charts(chart_dir, dpi=args.dpi, use_cache=not args.no_chart_cache)
         print("      ✓ 10 professional charts generated")
         
         if args.verbose:
@@ -113,12 +146,22 @@ Examples:
         report_gen.add_executive_summary(analysis_results)
         print("      ✓ Executive summary added")
         
+        if args.preview:
+            report_gen.add_sampling_summary(analysis_results)
+            print("      ✓ Preview sampling summary added")
+        
         report_gen.add_numeric_analysis(analysis_results)
         print("      ✓ Numeric analysis added")
         
+        report_gen.add_outlier_analysis(analysis_results)
+        print("      ✓ Outlier detection added")
+        
         report_gen.add_categorical_analysis(analysis_results)
         print("      ✓ Categorical analysis added")
         
+        report_gen.add_segmentation_analysis(analysis_results)
+        print("      ✓ Segmentation analysis added")
+        
         report_gen.add_correlations(analysis_results)
         print("      ✓ Correlation analysis added")
         
@@ -139,7 +182,11 @@ Examples:
         print("=" * 70)
         print(f"📄 Report saved to: {os.path.abspath(output_pdf)}")
         print(f"📊 Charts saved to: {os.path.abspath(chart_dir)}")
+        print(f"🧾 Summary saved to: {os.path.abspath(summary_path)}")
         print(f"⏱️  Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        if args.preview:
+            print("ℹ️  Preview report - for exact figures rerun without --preview:")
+            print(f"    python generate_report.py \"{args.input_file}\"")
         print("=" * 70)
         
         return 0
@@ -151,5 +198,62 @@ Examples:
             traceback.print_exc()
         return 1
 
+def compare_main(args):
+    """Build a drift comparison report from two stored run summaries"""
+    baseline_file, current_file = args.compare
+    for path in (baseline_file, current_file):
+        if not os.path.exists(path):
+            print(f"❌ Error: Summary file '{path}' not found!")
+            return 1
+    
+    output_pdf = args.output or os.path.join('output', f"drift_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
+    os.makedirs(os.path.dirname(os.path.abspath(output_pdf)), exist_ok=True)
+    
+    print("=" * 70)
+    print("🚀 INSIGHTIFY - DATASET DRIFT COMPARISON")
+    print("=" * 70)
+    print(f"📁 Baseline: {baseline_file}")
+    print(f"📁 Current:  {current_file}")
+    print(f"📄 Output PDF: {output_pdf}")
+    print("=" * 70)
+    
+    try:
+        print("\n[1/3] Loading stored summaries...")
+        baseline, current = load_summary(baseline_file), load_summary(current_file)
+        print("      ✓ Summaries loaded")
+        
+        print("\n[2/3] Computing drift metrics...")
+        drift = compare_summaries(baseline, current)
+        print(f"      ✓ {drift['drifted_columns']} significant, {drift['moderate_columns']} moderate drift")
+        if args.verbose:
+            for col, stats in {**drift['numeric'], **drift['categorical']}.items():
+                psi = f"{stats['psi']:.3f}" if stats['psi'] is not None else 'N/A'
+                print(f"      - {col}: PSI {psi} ({stats['status']})")
+        
+        print("\n[3/3] Building PDF...")
+        report_gen = PDFReportGenerator(output_pdf)
+        report_gen.add_title_page(
+            "Dataset Drift Report",
+            f"{baseline['source']} vs {current['source']}",
+            datetime.now().strftime("%B %d, %Y")
+        )
+        report_gen.add_drift_comparison(drift)
+        report_gen.build()
+        print("      ✓ PDF built successfully")
+        
+        print("\n" + "=" * 70)
+        print("✅ DRIFT COMPARISON COMPLETED SUCCESSFULLY!")
+        print("=" * 70)
+        print(f"📄 Report saved to: {os.path.abspath(output_pdf)}")
+        print("=" * 70)
+        return 0
+    
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+
 if __name__ == '__main__':
     sys.exit(main())
@@ -7,38 +7,421 @@ Serves the professional web interface and handles report generation
 import os
 import sys
 import json
+import argparse
 import threading
 import functools
 import io
+import gzip
+import math
+import time
+import uuid
 import tempfile
+import email.utils
 from email import message_from_binary_file
 from email.parser import BytesParser
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 from pathlib import Path
 from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
+
+import matplotlib
+matplotlib.use('Agg')  # Charts are rendered from request threads, never shown on screen
+
 from backend.data_analyzer import DataAnalyzer
+from backend.drift import SUMMARY_DIR, build_summary, compare_summaries, load_summary, save_summary
 from backend.report_generator import PDFReportGenerator
+from backend.serializer import MSGPACK_CONTENT_TYPE
+
+try:
+    import brotli
+except ImportError:  # Optional dependency, gzip is used when brotli is unavailable
+    brotli = None
+
+# Served paths are relative to the server's working directory (see run_server)
+FRONTEND_DIR = 'frontend'
+OUTPUT_DIR = 'output'
+
+# Text assets worth compressing (images/PDFs are already compressed)
+COMPRESSIBLE_EXTENSIONS = {'.html', '.css', '.js', '.json', '.svg', '.txt'}
+
+# (path, encoding) -> (mtime_ns, compressed bytes)
+_compressed_assets = {}
+_compressed_assets_lock = threading.Lock()
+
+
+def compress_asset(path, encoding):
+    """Return compressed bytes for a frontend asset, recompressing only when the file changes"""
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _compressed_assets.get((path, encoding))
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+    
+    with open(path, 'rb') as f:
+        raw = f.read()
+    
+    if encoding == 'br':
+        data = brotli.compress(raw, quality=11)
+    else:
+        data = gzip.compress(raw, compresslevel=9, mtime=0)
+    
+    with _compressed_assets_lock:
+        _compressed_assets[(path, encoding)] = (mtime_ns, data)
+    return data
+
+
+def precompress_assets(directory=FRONTEND_DIR):
+    """Compress all text assets up front so the first page load is already served compressed"""
+    encodings = ['gzip'] + (['br'] if brotli is not None else [])
+    count = 0
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path) and os.path.splitext(name)[1] in COMPRESSIBLE_EXTENSIONS:
+            for encoding in encodings:
+                compress_asset(path, encoding)
+            count += 1
+    print(f"[*] Precompressed {count} frontend assets ({', '.join(encodings)})")
+
+
+# Admission control defaults (overridable on the command line)
+MAX_UPLOAD_MB = 500          # Matches the frontend's upload limit
+MAX_CONCURRENT_JOBS = 2
+MAX_QUEUED_JOBS = 8
+MEMORY_BUDGET_MB = 4096
+QUEUE_TIMEOUT = 60           # Seconds a queued job waits before giving up with 503
+
+# pandas typically needs several times the raw upload size once parsed
+MEMORY_PER_UPLOAD_BYTE = 8
+# Request bodies up to this size carry no real upload and are parsed before admission,
+# so a 'source' re-run is sized by the stored file it names rather than by its tiny body
+SMALL_FORM_BYTES = 64 * 1024
+
+# pyplot keeps global state, so concurrent jobs take turns rendering charts
+CHART_RENDER_LOCK = threading.Lock()
+
+
+class AdmissionRejected(Exception):
+    """Raised when a job cannot be admitted; carries the HTTP status and Retry-After hint"""
+    
+    def __init__(self, status, message, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Bounds concurrent report jobs by count and estimated memory, with a bounded wait queue"""
+    
+    def __init__(self, max_concurrent=MAX_CONCURRENT_JOBS, max_queued=MAX_QUEUED_JOBS,
+                 memory_budget=MEMORY_BUDGET_MB * 1024 * 1024, queue_timeout=QUEUE_TIMEOUT):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.memory_budget = memory_budget
+        self.queue_timeout = queue_timeout
+        self.running = 0
+        self.waiting = 0
+        self.memory_in_use = 0
+        self.avg_job_seconds = 10.0
+        self._cond = threading.Condition()
+    
+    def estimate_memory(self, content_length):
+        return content_length * MEMORY_PER_UPLOAD_BYTE
+    
+    def retry_after(self):
+        """Rough seconds until a slot frees up, from the running average job time"""
+        backlog = (self.waiting + self.running + 1) / max(self.max_concurrent, 1)
+        return max(1, math.ceil(self.avg_job_seconds * backlog))
+    
+    def _fits(self, estimate):
+        """Whether a job could start now (caller holds the lock)"""
+        return self.running < self.max_concurrent and self.memory_in_use + estimate <= self.memory_budget
+    
+    def acquire(self, estimate):
+        """Block until the job fits the concurrency and memory budget, or raise AdmissionRejected"""
+        with self._cond:
+            if estimate > self.memory_budget:
+                raise AdmissionRejected(413, 'Upload is too large for the server memory budget')
+            # The queue limit only applies to jobs that cannot start right away
+            if not self._fits(estimate) and self.waiting >= self.max_queued:
+                raise AdmissionRejected(429, 'Too many queued report requests', self.retry_after())
+            
+            self.waiting += 1
+            deadline = time.monotonic() + self.queue_timeout
+            try:
+                while not self._fits(estimate):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise AdmissionRejected(503, 'Server busy, please retry later', self.retry_after())
+                    self._cond.wait(remaining)
+            finally:
+                self.waiting -= 1
+            
+            self.running += 1
+            self.memory_in_use += estimate
+            return time.monotonic()
+    
+    def release(self, estimate, started):
+        with self._cond:
+            self.running -= 1
+            self.memory_in_use -= estimate
+            # Exponential moving average of job duration feeds Retry-After
+            self.avg_job_seconds = 0.8 * self.avg_job_seconds + 0.2 * (time.monotonic() - started)
+            self._cond.notify_all()
+
+
+def new_job_id():
+    """Unique per-request id for uploads and outputs (timestamps alone collide within a second)"""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+
+def parse_number(value, kind, field):
+    """Parse a numeric form field, raising ValueError with a client-facing message"""
+    try:
+        number = kind(value.strip())
+    except ValueError:
+        raise ValueError(f"{field} must be a number, got '{value.strip()}'") from None
+    if not math.isfinite(number):
+        raise ValueError(f"{field} must be a finite number")
+    return number
+
+
+def parse_byte_range(header, size):
+    """Parse a single 'bytes=start-end' Range header into (start, end), or None if unsatisfiable"""
+    units, _, spec = header.partition('=')
+    if units.strip() != 'bytes' or ',' in spec:
+        # Multipart ranges are not supported - caller falls back to a full response
+        raise ValueError('Unsupported range')
+    
+    start, _, end = spec.strip().partition('-')
+    if start:
+        start = int(start)
+        end = int(end) if end else size - 1
+    else:
+        # Suffix range: last N bytes
+        length = int(end)
+        if length == 0:
+            return None
+        start = max(size - length, 0)
+        end = size - 1
+    
+    if start >= size or start > end:
+        return None
+    return start, min(end, size - 1)
+
 
 class InsightifyRequestHandler(SimpleHTTPRequestHandler):
     """Custom HTTP request handler for Insightify"""
     
+    # Process-pool size for per-column analysis (set by run_server)
+    analysis_workers = 1
+    max_upload_bytes = MAX_UPLOAD_MB * 1024 * 1024
+    admission = AdmissionController()
+    # (form_data, file_data) when the body was parsed before admission
+    parsed_form = None
+    
     def do_GET(self):
         """Handle GET requests"""
+        self.rewrite_frontend_path()
+        self.serve_file()
+    
+    def do_HEAD(self):
+        """Handle HEAD requests"""
+        self.rewrite_frontend_path()
+        self.serve_file(head_only=True)
+    
+    def rewrite_frontend_path(self):
+        """Map the site root and top-level asset names onto the frontend directory"""
         if self.path == '/':
             self.path = '/frontend/index.html'
         elif self.path in ['/styles.css', '/app.js', '/index.html']:
             self.path = '/frontend' + self.path.replace('/frontend', '')
-        return super().do_GET()
+    
+    def serve_file(self, head_only=False):
+        """Serve a file with conditional GET, compression, byte ranges and zero-copy transfer"""
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            # Directory listings/redirects are left to the stock handler
+            return super().do_HEAD() if head_only else super().do_GET()
+        
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            self.send_error(404, "File not found")
+            return
+        
+        with f:
+            st = os.fstat(f.fileno())
+            etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+            relative = os.path.relpath(path, self.directory)
+            in_frontend = relative.startswith(FRONTEND_DIR + os.sep)
+            in_output = relative.startswith(OUTPUT_DIR + os.sep)
+            
+            encoding = None
+            if in_frontend and os.path.splitext(path)[1] in COMPRESSIBLE_EXTENSIONS:
+                encoding = self.preferred_encoding()
+            if encoding:
+                etag = etag[:-1] + f'-{encoding}"'
+            
+            if self.not_modified(etag, st.st_mtime):
+                self.send_response(304)
+                self.send_cache_headers(etag, st.st_mtime, in_frontend)
+                self.end_headers()
+                return
+            
+            if encoding:
+                body = compress_asset(path, encoding)
+                self.send_response(200)
+                self.send_header('Content-Type', self.guess_type(path))
+                self.send_header('Content-Encoding', encoding)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_cache_headers(etag, st.st_mtime, in_frontend)
+                self.end_headers()
+                if not head_only:
+                    self.wfile.write(body)
+                return
+            
+            start, end = 0, st.st_size - 1
+            status = 200
+            range_header = self.headers.get('Range')
+            if in_output and range_header and self.range_applies(etag, st.st_mtime):
+                try:
+                    byte_range = parse_byte_range(range_header, st.st_size)
+                except ValueError:
+                    byte_range = (start, end)
+                if byte_range is None:
+                    self.send_response(416)
+                    self.send_header('Content-Range', f'bytes */{st.st_size}')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                start, end = byte_range
+                status = 206 if (start, end) != (0, st.st_size - 1) else 200
+            
+            length = end - start + 1
+            self.send_response(status)
+            self.send_header('Content-Type', self.guess_type(path))
+            self.send_header('Content-Length', str(length))
+            if in_output:
+                self.send_header('Accept-Ranges', 'bytes')
+            if status == 206:
+                self.send_header('Content-Range', f'bytes {start}-{end}/{st.st_size}')
+            self.send_cache_headers(etag, st.st_mtime, in_frontend)
+            self.end_headers()
+            
+            if not head_only and length > 0:
+                # socket.sendfile uses os.sendfile where available and falls back to send()
+                self.wfile.flush()
+                self.connection.sendfile(f, offset=start, count=length)
+    
+    def preferred_encoding(self):
+        """Pick the best content-coding the client accepts (brotli > gzip)"""
+        accepted = {
+            token.split(';')[0].strip().lower()
+            for token in self.headers.get('Accept-Encoding', '').split(',')
+            if not token.strip().endswith(';q=0')
+        }
+        if brotli is not None and 'br' in accepted:
+            return 'br'
+        if 'gzip' in accepted:
+            return 'gzip'
+        return None
+    
+    def not_modified(self, etag, mtime):
+        """Evaluate If-None-Match / If-Modified-Since against the current representation"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or etag in tags or f'W/{etag}' in tags
+        
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since.timestamp()
+        return False
+    
+    def range_applies(self, etag, mtime):
+        """Honour If-Range: only serve a partial response if the validator still matches"""
+        if_range = self.headers.get('If-Range')
+        if not if_range:
+            return True
+        if if_range.startswith('"') or if_range.startswith('W/'):
+            return if_range == etag
+        return if_range == self.date_time_string(mtime)
+    
+    def send_cache_headers(self, etag, mtime, vary_encoding):
+        """Validators so browsers revalidate cheaply instead of re-downloading"""
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', self.date_time_string(mtime))
+        self.send_header('Cache-Control', 'no-cache')
+        if vary_encoding:
+            self.send_header('Vary', 'Accept-Encoding')
     
     def do_POST(self):
         """Handle POST requests for report generation"""
-        if self.path == '/api/generate-report':
-            self.handle_report_generation()
+        route = urlsplit(self.path).path
+        if route == '/api/generate-report':
+            self.run_admitted(self.handle_report_generation)
+        elif route == '/api/analyze':
+            self.run_admitted(self.handle_analysis)
+        elif route == '/api/compare':
+            self.run_admitted(self.handle_comparison)
         else:
             self.send_error(404)
     
+    def run_admitted(self, handler):
+        """Check the upload size and admit the job (only small bodies are read before admission)"""
+        content_length = self.headers.get('Content-Length')
+        if content_length is None:
+            self.close_connection = True
+            self.send_json_response({'error': 'Content-Length header is required'}, 411)
+            return
+        
+        try:
+            content_length = int(content_length)
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            self.close_connection = True
+            self.send_json_response({'error': 'Invalid Content-Length header'}, 400)
+            return
+        
+        if content_length > self.max_upload_bytes:
+            # The body is never read, so the connection cannot be reused
+            self.close_connection = True
+            self.send_json_response({
+                'error': f'Upload exceeds the {self.max_upload_bytes // (1024 * 1024)} MB limit'
+            }, 413)
+            return
+        
+        estimate = self.admission.estimate_memory(content_length)
+        self.parsed_form = None
+        if content_length <= SMALL_FORM_BYTES:
+            self.parsed_form = self.parse_multipart_form_data()
+            source_path = self.source_path(self.parsed_form[0])
+            if source_path:
+                estimate = max(estimate, self.admission.estimate_memory(os.path.getsize(source_path)))
+        
+        try:
+            started = self.admission.acquire(estimate)
+        except AdmissionRejected as e:
+            print(f"[!] Rejected request ({e.status}): {e}")
+            self.close_connection = True
+            headers = {'Retry-After': str(e.retry_after)} if e.retry_after else None
+            self.send_json_response({'error': str(e)}, e.status, headers)
+            return
+        
+        try:
+            handler()
+        finally:
+            self.admission.release(estimate, started)
+    
     def parse_multipart_form_data(self):
         """Parse multipart/form-data without using deprecated cgi module"""
+        if self.parsed_form is not None:
+            return self.parsed_form
+        
         content_type = self.headers.get('Content-Type', '')
         if 'multipart/form-data' not in content_type:
             return None, None
@@ -96,61 +479,60 @@ class InsightifyRequestHandler(SimpleHTTPRequestHandler):
         return form_data, file_data
     
     def handle_report_generation(self):
-        """Handle report generation request with file upload"""
+        """Handle report generation request with file upload (or a previous upload via 'source')"""
         try:
             print("[*] Received report generation request")
             
             # Parse form data
             form_data, file_data = self.parse_multipart_form_data()
             
-            if not file_data or not file_data.get('filename'):
-                self.send_json_response({'error': 'No file uploaded'}, 400)
+            # Validate options before the upload is written to disk
+            try:
+                preview_options = self.requested_preview(form_data)
+                segment_options = self.requested_segments(form_data)
+            except ValueError as e:
+                self.send_json_response({'error': str(e)}, 400)
                 return
             
-            print(f"[*] File received: {file_data['filename']}")
-            
-            # Save the file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            upload_dir = "data"
-            if not os.path.exists(upload_dir):
-                os.makedirs(upload_dir)
-            
-            safe_filename = f"upload_{timestamp}_{os.path.basename(file_data['filename'])}"
-            file_path = os.path.join(upload_dir, safe_filename)
-            
-            with open(file_path, 'wb') as f:
-                f.write(file_data['content'])
-            
-            print(f"[*] File saved to: {file_path}")
+            job_id = new_job_id()
+            file_path = self.resolve_input_file(form_data, file_data, job_id)
+            if file_path is None:
+                self.send_json_response({'error': 'No file uploaded'}, 400)
+                return
             
             # Get other form fields
             report_title = form_data.get('title', 'Professional Data Analysis Report')
             report_subtitle = form_data.get('subtitle', 'Comprehensive Analysis & Insights')
             
-            print(f"[*] Starting analysis...")
+            print(f"[*] Starting {'preview ' if preview_options else ''}analysis...")
             
             # Generate report
             output_dir = "output"
             if not os.path.exists(output_dir):
                 os.makedirs(output_dir)
                 
-            output_pdf = os.path.join(output_dir, f"report_{timestamp}.pdf")
-            chart_dir = os.path.join(output_dir, f"charts_{timestamp}")
+            output_pdf = os.path.join(output_dir, f"report_{job_id}.pdf")
+            chart_dir = os.path.join(output_dir, f"charts_{job_id}")
             
             # Run analysis
-            analyzer = DataAnalyzer(file_path)
-            analysis_results = analyzer.perform_analysis()
+            analyzer = DataAnalyzer(file_path, columns=self.requested_columns(form_data), **preview_options)
+            analysis_results = analyzer.perform_analysis(workers=self.analysis_workers, **segment_options)
             print(f"[*] Analysis complete")
+            save_summary(build_summary(analyzer), self.summary_path(job_id))
             
-            analyzer.generate_charts(chart_dir)
+            with CHART_RENDER_LOCK:
+                analyzer.generate_charts(chart_dir)
             print(f"[*] Charts generated")
             
             # Generate PDF
             report_gen = PDFReportGenerator(output_pdf)
             report_gen.add_title_page(report_title, report_subtitle, datetime.now().strftime("%B %d, %Y"))
             report_gen.add_executive_summary(analysis_results)
+            report_gen.add_sampling_summary(analysis_results)
             report_gen.add_numeric_analysis(analysis_results)
+            report_gen.add_outlier_analysis(analysis_results)
             report_gen.add_categorical_analysis(analysis_results)
+            report_gen.add_segmentation_analysis(analysis_results)
             report_gen.add_correlations(analysis_results)
             report_gen.add_visualizations(chart_dir)
             report_gen.add_conclusions()
@@ -162,7 +544,92 @@ class InsightifyRequestHandler(SimpleHTTPRequestHandler):
                 'success': True,
                 'report': f"/{output_pdf}",
                 'charts': f"/{chart_dir}",
-                'message': 'Report generated successfully'
+                'preview': bool(preview_options),
+                # Send back as 'source' (without 'preview') to build the exact full report
+                'source': os.path.basename(file_path),
+                # Pass as 'baseline'/'current' to /api/compare for drift against other runs
+                'summary': job_id,
+                'message': 'Preview report generated successfully' if preview_options else 'Report generated successfully'
+            })
+        
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            self.send_json_response({'error': str(e)}, 500)
+    
+    def handle_analysis(self):
+        """Handle analysis-only request: returns stats as JSON/MessagePack without charts or PDF"""
+        try:
+            print("[*] Received analysis request")
+            
+            form_data, file_data = self.parse_multipart_form_data()
+            
+            # Validate options before the upload is written to disk
+            try:
+                preview_options = self.requested_preview(form_data)
+                segment_options = self.requested_segments(form_data)
+            except ValueError as e:
+                self.send_json_response({'error': str(e)}, 400)
+                return
+            
+            job_id = new_job_id()
+            file_path = self.resolve_input_file(form_data, file_data, job_id)
+            if file_path is None:
+                self.send_json_response({'error': 'No file uploaded'}, 400)
+                return
+            
+            analyzer = DataAnalyzer(file_path, columns=self.requested_columns(form_data), **preview_options)
+            analyzer.perform_analysis(workers=self.analysis_workers, **segment_options)
+            save_summary(build_summary(analyzer), self.summary_path(job_id))
+            
+            try:
+                payload, content_type = analyzer.serialize_results(self.requested_format(form_data))
+            except (RuntimeError, ValueError) as e:
+                # Unknown format, or msgpack requested but not installed
+                self.send_json_response({'error': str(e)}, 406)
+                return
+            
+            self.send_bytes_response(payload, content_type, headers={'X-Summary-Id': job_id})
+        
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            self.send_json_response({'error': str(e)}, 500)
+    
+    def handle_comparison(self):
+        """Drift between two stored run summaries ('baseline' and 'current' summary ids) - no raw data is read"""
+        try:
+            print("[*] Received drift comparison request")
+            
+            form_data, _ = self.parse_multipart_form_data()
+            form_data = form_data or {}
+            
+            summaries = {}
+            for field in ('baseline', 'current'):
+                summary_id = form_data.get(field, '').strip()
+                path = self.summary_path(summary_id) if summary_id else None
+                if not path or not os.path.isfile(path):
+                    self.send_json_response({'error': f"Unknown {field} summary '{summary_id}'"}, 404 if summary_id else 400)
+                    return
+                summaries[field] = load_summary(path)
+            
+            drift = compare_summaries(summaries['baseline'], summaries['current'])
+            
+            job_id = new_job_id()
+            output_pdf = os.path.join(OUTPUT_DIR, f"drift_{job_id}.pdf")
+            report_gen = PDFReportGenerator(output_pdf)
+            report_gen.add_title_page(
+                form_data.get('title', 'Dataset Drift Report'),
+                f"{summaries['baseline']['source']} vs {summaries['current']['source']}",
+                datetime.now().strftime("%B %d, %Y"))
+            report_gen.add_drift_comparison(drift)
+            report_gen.build()
+            print(f"[✓] Drift report generated: {output_pdf}")
+            
+            self.send_json_response({
+                'success': True,
+                'report': f"/{output_pdf}",
+                'drift': drift
             })
         
         except Exception as e:
@@ -170,11 +637,116 @@ class InsightifyRequestHandler(SimpleHTTPRequestHandler):
             traceback.print_exc()
             self.send_json_response({'error': str(e)}, 500)
     
-    def send_json_response(self, data, status_code=200):
+    def summary_path(self, summary_id):
+        """Stored run summary for a job id (bare ids only, so requests cannot escape the summary directory)"""
+        return os.path.join(SUMMARY_DIR, f"summary_{os.path.basename(summary_id)}.json")
+    
+    def resolve_input_file(self, form_data, file_data, job_id):
+        """Save a new upload, or reuse a previous one named by the 'source' field; None if neither"""
+        if file_data and file_data.get('filename'):
+            print(f"[*] File received: {file_data['filename']}")
+            return self.save_uploaded_file(file_data, job_id)
+        
+        file_path = self.source_path(form_data)
+        if file_path:
+            print(f"[*] Reusing uploaded file: {file_path}")
+        return file_path
+    
+    def source_path(self, form_data):
+        """Previous upload named by the 'source' field, or None"""
+        source = (form_data or {}).get('source', '').strip()
+        if source:
+            # Only bare file names inside the upload directory are accepted
+            file_path = os.path.join("data", os.path.basename(source))
+            if os.path.isfile(file_path):
+                return file_path
+        return None
+    
+    def requested_preview(self, form_data):
+        """DataAnalyzer preview options from the 'preview', 'preview_rows' and 'time_budget' form fields;
+        raises ValueError on malformed or out-of-range values"""
+        form_data = form_data or {}
+        if form_data.get('preview', '').strip().lower() not in ('1', 'true', 'on', 'yes'):
+            return {}
+        
+        options = {'preview': True}
+        if form_data.get('preview_rows', '').strip():
+            options['row_budget'] = parse_number(form_data['preview_rows'], int, 'preview_rows')
+            if options['row_budget'] < 1:
+                raise ValueError('preview_rows must be at least 1')
+        if form_data.get('time_budget', '').strip():
+            options['time_budget'] = parse_number(form_data['time_budget'], float, 'time_budget')
+            if not options['time_budget'] > 0:
+                raise ValueError('time_budget must be a positive number of seconds')
+        return options
+    
+    def requested_segments(self, form_data):
+        """perform_analysis options from 'segment_by' ('Region;Region,Category'), 'measures' and 'top_n' fields"""
+        form_data = form_data or {}
+        options = {}
+        if form_data.get('segment_by', '').strip():
+            options['segment_by'] = [
+                [c.strip() for c in group.split(',') if c.strip()]
+                for group in form_data['segment_by'].split(';') if group.strip()
+            ]
+        if form_data.get('measures', '').strip():
+            options['measures'] = [c.strip() for c in form_data['measures'].split(',') if c.strip()]
+        if form_data.get('top_n', '').strip():
+            options['top_n'] = parse_number(form_data['top_n'], int, 'top_n')
+            if options['top_n'] < 1:
+                raise ValueError('top_n must be at least 1')
+        return options
+    
+    def requested_columns(self, form_data):
+        """Optional comma-separated 'columns' form field - only these columns are read from the upload"""
+        columns = (form_data or {}).get('columns', '').strip()
+        if not columns:
+            return None
+        return [c.strip() for c in columns.split(',') if c.strip()]
+    
+    def requested_format(self, form_data=None):
+        """Pick the response format from ?format=, a 'format' form field or the Accept header"""
+        query = parse_qs(urlsplit(self.path).query)
+        fmt = query.get('format', [None])[0] or (form_data or {}).get('format')
+        if fmt:
+            return fmt
+        accept = self.headers.get('Accept', '')
+        if MSGPACK_CONTENT_TYPE in accept or 'application/x-msgpack' in accept:
+            return 'msgpack'
+        return 'json'
+    
+    def save_uploaded_file(self, file_data, job_id):
+        """Persist an uploaded file under data/ and return its path"""
+        upload_dir = "data"
+        if not os.path.exists(upload_dir):
+            os.makedirs(upload_dir)
+        
+        safe_filename = f"upload_{job_id}_{os.path.basename(file_data['filename'])}"
+        file_path = os.path.join(upload_dir, safe_filename)
+        
+        with open(file_path, 'wb') as f:
+            f.write(file_data['content'])
+        
+        print(f"[*] File saved to: {file_path}")
+        return file_path
+    
+    def send_bytes_response(self, payload, content_type, status_code=200, headers=None):
+        """Send a pre-serialized response body"""
+        self.send_response(status_code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def send_json_response(self, data, status_code=200, headers=None):
         """Send JSON response"""
         self.send_response(status_code)
         self.send_header('Content-Type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         self.end_headers()
         self.wfile.write(json.dumps(data).encode('utf-8'))
     
@@ -185,12 +757,20 @@ class InsightifyRequestHandler(SimpleHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         super().end_headers()
 
-def run_server(port=8000):
+def run_server(port=8000, workers=1, max_upload_mb=MAX_UPLOAD_MB, max_concurrent=MAX_CONCURRENT_JOBS,
+               max_queued=MAX_QUEUED_JOBS, memory_budget_mb=MEMORY_BUDGET_MB):
     """Run the Insightify web server"""
     server_address = ('', port)
+    InsightifyRequestHandler.analysis_workers = workers
+    InsightifyRequestHandler.max_upload_bytes = max_upload_mb * 1024 * 1024
+    InsightifyRequestHandler.admission = AdmissionController(
+        max_concurrent=max_concurrent, max_queued=max_queued,
+        memory_budget=memory_budget_mb * 1024 * 1024)
     # Serve from current directory (root) so we can access data, output, and frontend
     # We will handle the redirection to frontend/index.html in do_GET
-    httpd = HTTPServer(server_address, InsightifyRequestHandler)
+    # Threaded so queued jobs can wait for admission while others run
+    httpd = ThreadingHTTPServer(server_address, InsightifyRequestHandler)
+    precompress_assets()
     
     print(f"""
     ╔════════════════════════════════════════════════════════════╗
@@ -212,5 +792,13 @@ def run_server(port=8000):
         print("[✓] Server stopped")
 
 if __name__ == '__main__':
-    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
-    run_server(port)
+    parser = argparse.ArgumentParser(description='Insightify web server')
+    parser.add_argument('port', nargs='?', type=int, default=8000, help='Port to listen on (default: 8000)')
+    parser.add_argument('--workers', type=int, default=1, help='Processes used for per-column analysis (default: 1)')
+    parser.add_argument('--max-upload-mb', type=int, default=MAX_UPLOAD_MB, help=f'Largest accepted upload (default: {MAX_UPLOAD_MB})')
+    parser.add_argument('--max-concurrent', type=int, default=MAX_CONCURRENT_JOBS, help=f'Reports processed at once (default: {MAX_CONCURRENT_JOBS})')
+    parser.add_argument('--max-queued', type=int, default=MAX_QUEUED_JOBS, help=f'Requests allowed to wait for a slot (default: {MAX_QUEUED_JOBS})')
+    parser.add_argument('--memory-budget-mb', type=int, default=MEMORY_BUDGET_MB, help=f'Estimated memory shared by running jobs (default: {MEMORY_BUDGET_MB})')
+    args = parser.parse_args()
+    run_server(args.port, args.workers, args.max_upload_mb, args.max_concurrent,
+               args.max_queued, args.memory_budget_mb)